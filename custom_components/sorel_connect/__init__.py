@@ -56,6 +56,10 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         """Handle the clear_metadata_cache service call."""
         _LOGGER.info("Clear metadata cache service called")
         count = clear_metadata_cache(hass.config.path("sorel_meta_cache"))
+        # Also forget metadata the running client still holds in memory
+        coordinator = hass.data.get(DOMAIN, {}).get("coordinator")
+        if coordinator is not None:
+            coordinator.meta.clear_memory_cache()
         _LOGGER.info("Service cleared %d cached metadata files", count)
 
     # Only register if not already registered
@@ -66,11 +70,10 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    # Load sensor types CSV early (before any sensors are created)
+    # Sensor types and relay modes are static tables in const.py
     sensor_types = load_sensor_types()
     _LOGGER.info("Sensor types loaded: %d types available", len(sensor_types))
 
-    # Load relay modes CSV
     relay_modes = load_relay_modes()
     _LOGGER.info("Relay modes loaded: %d modes available", len(relay_modes))
 
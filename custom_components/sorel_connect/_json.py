@@ -0,0 +1,62 @@
+"""JSON helpers for the Sorel Connect integration, backed by orjson (bundled with Home Assistant)."""
+from __future__ import annotations
+from functools import lru_cache
+from typing import Any
+
+import orjson
+
+# Payloads with at most this many scalar fields are served from the serialize cache
+SERIALIZE_CACHE_MAX_FIELDS = 8
+
+# Floats are left out: -0.0 == 0.0 (and NaN never equals itself), so they
+# would make distinct payloads share a cache entry
+_CACHEABLE_TYPES = (str, int, bool, type(None))
+
+# Match json.dumps, which accepts non-string (e.g. int) keys
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+@lru_cache(maxsize=256)
+def _dumps_flat(frozen_payload: tuple) -> bytes:
+    """Serialize a frozen (key, type, value) tuple back into a JSON object."""
+    return orjson.dumps({key: value for key, _, value in frozen_payload}, option=_DUMPS_OPTIONS)
+
+
+def dumps_bytes(payload: dict) -> bytes:
+    """
+    Serialize a payload straight to UTF-8 JSON bytes in a single pass.
+
+    The output is orjson's compact form: no spaces after separators, and
+    NaN/Infinity written as null. It is equivalent to, but not byte-identical
+    with, json.dumps.
+
+    Small flat dicts of strings, ints, bools and None (status/availability
+    payloads) are published over and over with identical content, so their
+    serialization is cached. The value type is part of the cache key to keep
+    True and 1 apart. Larger, nested or float-carrying payloads are
+    serialized directly.
+    """
+    if len(payload) <= SERIALIZE_CACHE_MAX_FIELDS and all(
+        isinstance(value, _CACHEABLE_TYPES) for value in payload.values()
+    ):
+        return _dumps_flat(tuple((key, type(value), value) for key, value in payload.items()))
+    return orjson.dumps(payload, option=_DUMPS_OPTIONS)
+
+
+def encode_payload(payload: dict | bytes | bytearray | memoryview) -> bytes | bytearray:
+    """
+    Return the wire bytes for a publish payload.
+
+    Pre-serialized payloads (e.g. republished messages) are passed through
+    as-is; only a memoryview is copied, since paho does not accept it.
+    """
+    if isinstance(payload, (bytes, bytearray)):
+        return payload
+    if isinstance(payload, memoryview):
+        return payload.tobytes()
+    return dumps_bytes(payload)
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Parse JSON from bytes or str without an intermediate decode."""
+    return orjson.loads(data)
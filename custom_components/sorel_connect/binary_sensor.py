@@ -1,20 +1,19 @@
 from __future__ import annotations
 import logging
 from datetime import datetime
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorDeviceClass,
 )
 from homeassistant.const import EntityCategory
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 
-from .const import DOMAIN, SIGNAL_NEW_DEVICE, SIGNAL_MQTT_CONNECTION_STATE, SIGNAL_DP_UPDATE
+from .const import DOMAIN, SIGNAL_NEW_DEVICE, SIGNAL_MQTT_CONNECTION_STATE, dp_signal
 from .topic_parser import ParsedTopic
-from .sensor_types import get_relay_config, is_relay_mode_register
+from .sensor_types import DP_KIND_RELAY_MODE, get_relay_config
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,7 +21,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     """Set up binary sensor platform for Sorel Connect."""
 
     # Track created binary relay sensors to avoid duplicates
-    binary_relay_sensors: dict[str, RelayBinarySensor] = {}
+    binary_relay_sensors: dict[tuple[str, int], RelayBinarySensor] = {}
+    # Value handlers of added relay sensors: (device_key, address) -> callback(value)
+    relay_callbacks = hass.data[DOMAIN].setdefault("relay_callbacks", {})
 
     # Create global MQTT connection status sensor (no device association)
     mqtt_connection_sensor = MqttConnectionStatusBinarySensor(entry)
@@ -31,15 +32,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     @callback
     def _on_new_device(pt: ParsedTopic):
         """Create binary sensor when new device is discovered."""
+        coordinator = hass.data[DOMAIN]["coordinator"]
         # Create metadata status binary sensor (problem indicator)
         entities = [
-            MetadataStatusBinarySensor(pt),
+            MetadataStatusBinarySensor(pt, coordinator),
         ]
         async_add_entities(entities, update_before_add=False)
 
+        # Listen for this device's DP updates to create binary relay sensors
+        entry.async_on_unload(async_dispatcher_connect(hass, dp_signal(pt.device_key), _on_dp_update))
+
     @callback
     def _on_dp_update(device_key: str, address: int, value):
-        """Handle datapoint update - create binary relay sensors for switched relays."""
+        """Handle datapoint update - route it to its relay sensor, or create binary relay sensors for switched relays."""
+        key = (device_key, address)
+        cb = relay_callbacks.get(key)
+        if cb is not None:
+            cb(value)
+            return
+        if key in binary_relay_sensors:
+            return  # Already created, not added yet
+
         # Get parsed topic from hass data
         parsed_topics = hass.data.get(DOMAIN, {}).get("parsed_topics", {})
         if device_key not in parsed_topics:
@@ -52,15 +65,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
         # Get datapoint metadata
         coordinator = hass.data[DOMAIN]["coordinator"]
-        datapoints = coordinator._datapoints.get(device_key, [])
-
-        # Find the datapoint for this address
-        dp_meta = None
-        for dp in datapoints:
-            if int(dp.get("address", -1)) == address:
-                dp_meta = dp
-                break
-
+        dp_meta = coordinator.get_dp_at_address(device_key, address)
         if not dp_meta:
             return  # Skip if no metadata
 
@@ -68,9 +73,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
         # Check if address N+1 has a mode register - if so, this might be a relay
         # Use address-based detection instead of name pattern matching
-        datapoints = coordinator._datapoints.get(device_key, [])
-        mode_dp_meta = next((d for d in datapoints if int(d.get("address")) == address + 1), None)
-        if not mode_dp_meta or not is_relay_mode_register(mode_dp_meta.get("name", "")):
+        if coordinator.get_dp_kind(device_key, address + 1).kind != DP_KIND_RELAY_MODE:
             return  # Not a relay
 
         # This is a relay - check if relay mode is known and if it's binary
@@ -80,15 +83,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
             return  # Mode not known yet
 
         config = get_relay_config(mode_id)
-        if not config['is_binary']:
+        if not config.is_binary:
             return  # Not a binary relay, will be handled by sensor platform
 
         # Create binary relay sensor
-        key = f"{device_key}::{address}"
-        if key in binary_relay_sensors:
-            return  # Already created
-
-        _LOGGER.info("Creating binary relay sensor: %s (mode=%s) at address %s", sensor_name, config['mode_name'], address)
+        _LOGGER.info("Creating binary relay sensor: %s (mode=%s) at address %s", sensor_name, config.mode_name, address)
         sensor = RelayBinarySensor(pt, dp_meta, coordinator, initial_value=value)
         binary_relay_sensors[key] = sensor
         async_add_entities([sensor], update_before_add=False)
@@ -97,9 +96,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     unsub_new = async_dispatcher_connect(hass, SIGNAL_NEW_DEVICE, _on_new_device)
     entry.async_on_unload(unsub_new)
 
-    # Listen for datapoint updates to create binary relay sensors
-    unsub_dp = async_dispatcher_connect(hass, SIGNAL_DP_UPDATE, _on_dp_update)
-    entry.async_on_unload(unsub_dp)
+
+@callback
+def _register_relay_callback(hass: HomeAssistant, device_key: str, address: int, on_value) -> CALLBACK_TYPE:
+    """Route DP update values for one relay to on_value; returns the unregister function."""
+    relay_callbacks = hass.data[DOMAIN]["relay_callbacks"]
+    key = (device_key, address)
+    relay_callbacks[key] = on_value
+
+    @callback
+    def _unregister() -> None:
+        if relay_callbacks.get(key) == on_value:
+            del relay_callbacks[key]
+
+    return _unregister
 
 
 class MetadataStatusBinarySensor(BinarySensorEntity):
@@ -110,15 +120,10 @@ class MetadataStatusBinarySensor(BinarySensorEntity):
     _attr_should_poll = False
     _attr_name = "Metadata Status"
 
-    def __init__(self, pt: ParsedTopic):
+    def __init__(self, pt: ParsedTopic, coordinator):
         self._pt = pt
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, pt.device_key)},
-            name=pt.device_name,
-            manufacturer=pt.oem_name,
-            model=pt.device_id,
-        )
-        self._attr_unique_id = f"{pt.device_key}::metadata_status".lower()
+        self._attr_device_info = coordinator.get_device_info(pt)
+        self._attr_unique_id = f"{pt.device_key}::metadata_status"
 
     @property
     def is_on(self) -> bool:
@@ -213,9 +218,6 @@ class MqttConnectionStatusBinarySensor(BinarySensorEntity):
             _on_connection_state_change
         )
 
-        # Write initial state
-        self.async_write_ha_state()
-
     @property
     def is_on(self) -> bool:
         """Return True if connected to MQTT broker."""
@@ -257,24 +259,18 @@ class RelayBinarySensor(BinarySensorEntity):
         self._pt = pt
         self._dp = dp
         self._coordinator = coordinator
-        self._value = initial_value
         self._unsub = None
 
         # Set up entity attributes
         self._attr_name = dp.get("name", "Unknown")
-        self._attr_unique_id = f"{pt.device_key}::{dp.get('address', 0)}".lower()
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, pt.device_key)},
-            name=pt.device_name,
-            manufacturer=pt.oem_name,
-            model=pt.device_id,
-        )
+        self._attr_unique_id = f"{pt.device_key}::{dp.get('address', 0)}"
+        self._attr_device_info = coordinator.get_device_info(pt)
 
         # Get relay mode info
         mode_id = coordinator.get_relay_mode(pt.device_key, self._attr_name)
         if mode_id is not None:
             config = get_relay_config(mode_id)
-            self._relay_mode_name = config['mode_name']
+            self._relay_mode_name = config.mode_name
         else:
             self._relay_mode_name = None
 
@@ -282,54 +278,55 @@ class RelayBinarySensor(BinarySensorEntity):
         self._attr_device_class = BinarySensorDeviceClass.POWER
         self._attr_icon = "mdi:electric-switch"
 
+        # Static attributes (metadata, relay mode); value-dependent ones are added in _set_value
+        base_attrs = dict(dp)
+        if self._relay_mode_name:
+            base_attrs['relay_mode'] = self._relay_mode_name
+        self._base_attrs = base_attrs
+        self._set_value(initial_value)
+
     async def async_added_to_hass(self):
         """Run when entity is added to Home Assistant."""
         await super().async_added_to_hass()
+        self._unsub = _register_relay_callback(
+            self.hass, self._pt.device_key, int(self._dp.get("address", -1)), self._on_value
+        )
 
-        @callback
-        def _handle_dp_update(device_key: str, address: int, value):
-            """Handle datapoint update signal."""
-            if device_key == self._pt.device_key and address == int(self._dp.get("address", -1)):
-                self._value = value
-                self.async_write_ha_state()
-
-        self._unsub = async_dispatcher_connect(self.hass, SIGNAL_DP_UPDATE, _handle_dp_update)
-        # Write initial state (already has value)
+    async def async_will_remove_from_hass(self):
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _on_value(self, value):
+        """Handle a new value for this relay."""
+        if value == self._value:
+            return  # Unchanged, skip the state write
+        self._set_value(value)
         self.async_write_ha_state()
 
-    @property
-    def is_on(self) -> bool:
-        """Return True if relay is on."""
+    def _set_value(self, value):
+        """Store a new value and derive on/off state, availability and attributes once."""
+        self._value = value
         # Binary relays use string values "on"/"off" after decoding
-        if isinstance(self._value, str):
-            return self._value.lower() == "on"
+        if isinstance(value, str):
+            self._attr_is_on = value.lower() == "on"
         # Fallback: treat non-zero as on
-        if isinstance(self._value, (int, float)):
-            return self._value != 0
-        return False
+        elif isinstance(value, (int, float)):
+            self._attr_is_on = value != 0
+        else:
+            self._attr_is_on = False
 
-    @property
-    def available(self) -> bool:
-        """Return True if relay is available."""
         # Negative values indicate errors
-        if isinstance(self._value, (int, float)):
-            return self._value >= 0
-        return self._value is not None
-
-    @property
-    def extra_state_attributes(self):
-        """Return additional state attributes."""
-        attrs = dict(self._dp)
-
-        # Add relay mode info
-        if self._relay_mode_name:
-            attrs['relay_mode'] = self._relay_mode_name
+        if isinstance(value, (int, float)):
+            self._attr_available = value >= 0
+        else:
+            self._attr_available = value is not None
 
+        attrs = dict(self._base_attrs)
         # Add error info for negative values
-        if isinstance(self._value, (int, float)) and self._value < 0:
+        if isinstance(value, (int, float)) and value < 0:
             attrs['error'] = 'Not connected'
-
         # Add raw value for debugging
-        attrs['raw_value'] = self._value
-
-        return attrs
+        attrs['raw_value'] = value
+        self._attr_extra_state_attributes = attrs
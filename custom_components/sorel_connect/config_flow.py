@@ -77,7 +77,8 @@ async def validate_mqtt_connection(host: str, port: int, username: str | None, p
         username=username,
         password=password,
         tls_enabled=tls,
-        on_message=dummy_callback
+        on_message=dummy_callback,
+        persistent=False,
     )
 
     try:
@@ -87,7 +88,7 @@ async def validate_mqtt_connection(host: str, port: int, username: str | None, p
     finally:
         # Always clean up
         try:
-            gateway.stop()
+            await gateway.async_stop()
         except Exception as e:
             _LOGGER.debug("Error stopping test MQTT gateway: %s", e)
 
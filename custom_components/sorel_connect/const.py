@@ -1,3 +1,5 @@
+from typing import NamedTuple, Optional
+
 DOMAIN = "sorel_connect"
 
 CONF_USE_HA_MQTT = "use_ha_mqtt"
@@ -17,6 +19,14 @@ SIGNAL_NEW_DEVICE = f"{DOMAIN}_new_device"
 SIGNAL_DP_UPDATE = "sorel_dp_update"
 SIGNAL_MQTT_CONNECTION_STATE = f"{DOMAIN}_mqtt_connection_state"
 
+
+def dp_signal(device_key: str) -> str:
+    """Return the datapoint update signal of one device.
+
+    Each device has its own signal, so a send only iterates that device's handlers.
+    """
+    return f"{SIGNAL_DP_UPDATE}_{device_key}"
+
 # --- Relay Modes --------------------------------------------------------------
 
 # Relay modes define how relay values are interpreted and displayed.
@@ -47,32 +57,42 @@ RELAY_MODES = {
 }
 
 # --- Sensor Types -------------------------------------------------------------
-SENSOR_TYPES = {
-    1:  {"type_name": "sensorContact",           "base_unit": None,   "device_class": None,           "temp_dependent": False},
-    2:  {"type_name": "sensorTemperature",       "base_unit": "°C",   "device_class": "temperature",  "temp_dependent": True},
-    3:  {"type_name": "sensorHumidity",          "base_unit": "%",    "device_class": "humidity",     "temp_dependent": False},
-    4:  {"type_name": "sensorBrightness",        "base_unit": "lux",  "device_class": "illuminance",  "temp_dependent": False},
-    5:  {"type_name": "sensorGlobalRadiation",   "base_unit": "W/m²", "device_class": "irradiance",   "temp_dependent": False},
-    6:  {"type_name": "sensorMotion",            "base_unit": None,   "device_class": None,           "temp_dependent": False},
-    7:  {"type_name": "sensorPresence",          "base_unit": None,   "device_class": None,           "temp_dependent": False},
-    8:  {"type_name": "targetTemperatureAir",    "base_unit": "°C",   "device_class": "temperature",  "temp_dependent": True},
-    9:  {"type_name": "switchBinaryGeneric",     "base_unit": None,   "device_class": None,           "temp_dependent": False},
-    10: {"type_name": "switchPower",             "base_unit": "W",    "device_class": "power",        "temp_dependent": False},
-    11: {"type_name": "switchMultilevelGeneric", "base_unit": None,   "device_class": None,           "temp_dependent": False},
-    12: {"type_name": "switchMultilevelPower",   "base_unit": "W",    "device_class": "power",        "temp_dependent": False},
-    13: {"type_name": "outputPwm",               "base_unit": "%",    "device_class": None,           "temp_dependent": False},
-    14: {"type_name": "outputDacPwm",            "base_unit": "%",    "device_class": None,           "temp_dependent": False},
-    15: {"type_name": "outputDac",               "base_unit": None,   "device_class": None,           "temp_dependent": False},
-    16: {"type_name": "thermostatHeatingMode",   "base_unit": None,   "device_class": None,           "temp_dependent": False},
-    17: {"type_name": "roomLocation",            "base_unit": None,   "device_class": None,           "temp_dependent": False},
-    18: {"type_name": "CO2Concentration",        "base_unit": "ppm",  "device_class": None,           "temp_dependent": False},
-    19: {"type_name": "AirPressure",             "base_unit": "hPa",  "device_class": "pressure",     "temp_dependent": False},
-    20: {"type_name": "IndoorAirQuality",        "base_unit": None,   "device_class": None,           "temp_dependent": False},
-    21: {"type_name": "targetTemperatureCLite",  "base_unit": "°C",   "device_class": "temperature",  "temp_dependent": True},
-    22: {"type_name": "wheel",                   "base_unit": None,   "device_class": None,           "temp_dependent": False},
-    23: {"type_name": "sensorFlow",              "base_unit": "L/min","device_class": None,           "temp_dependent": False},
-    24: {"type_name": "sensorFrequency",         "base_unit": "Hz",   "device_class": "frequency",    "temp_dependent": False},
-    25: {"type_name": "sensorDuty",              "base_unit": "%",    "device_class": None,           "temp_dependent": False},
-    26: {"type_name": "sensorPulse (flow)",      "base_unit": "L",    "device_class": None,           "temp_dependent": False},
-    27: {"type_name": "sensorPressure",          "base_unit": "bar",  "device_class": "pressure",     "temp_dependent": False},
+
+class SensorType(NamedTuple):
+    """Static description of a sensor type."""
+
+    type_name: str
+    base_unit: Optional[str]
+    device_class: Optional[str]
+    temp_dependent: bool
+
+
+SENSOR_TYPES: dict[int, SensorType] = {
+    1:  SensorType("sensorContact",           None,   None,           False),
+    2:  SensorType("sensorTemperature",       "°C",   "temperature",  True),
+    3:  SensorType("sensorHumidity",          "%",    "humidity",     False),
+    4:  SensorType("sensorBrightness",        "lux",  "illuminance",  False),
+    5:  SensorType("sensorGlobalRadiation",   "W/m²", "irradiance",   False),
+    6:  SensorType("sensorMotion",            None,   None,           False),
+    7:  SensorType("sensorPresence",          None,   None,           False),
+    8:  SensorType("targetTemperatureAir",    "°C",   "temperature",  True),
+    9:  SensorType("switchBinaryGeneric",     None,   None,           False),
+    10: SensorType("switchPower",             "W",    "power",        False),
+    11: SensorType("switchMultilevelGeneric", None,   None,           False),
+    12: SensorType("switchMultilevelPower",   "W",    "power",        False),
+    13: SensorType("outputPwm",               "%",    None,           False),
+    14: SensorType("outputDacPwm",            "%",    None,           False),
+    15: SensorType("outputDac",               None,   None,           False),
+    16: SensorType("thermostatHeatingMode",   None,   None,           False),
+    17: SensorType("roomLocation",            None,   None,           False),
+    18: SensorType("CO2Concentration",        "ppm",  None,           False),
+    19: SensorType("AirPressure",             "hPa",  "pressure",     False),
+    20: SensorType("IndoorAirQuality",        None,   None,           False),
+    21: SensorType("targetTemperatureCLite",  "°C",   "temperature",  True),
+    22: SensorType("wheel",                   None,   None,           False),
+    23: SensorType("sensorFlow",              "L/min",None,           False),
+    24: SensorType("sensorFrequency",         "Hz",   "frequency",    False),
+    25: SensorType("sensorDuty",              "%",    None,           False),
+    26: SensorType("sensorPulse (flow)",      "L",    None,           False),
+    27: SensorType("sensorPressure",          "bar",  "pressure",     False),
 }
@@ -1,18 +1,24 @@
 from __future__ import annotations
 import logging
-import json
 import time
 from collections import defaultdict
+from functools import lru_cache
 from typing import Dict, Set, List, Tuple, Any, Optional
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from .const import DOMAIN, SIGNAL_NEW_DEVICE, SIGNAL_DP_UPDATE
-from .topic_parser import parse_topic, ParsedTopic
+from homeassistant.helpers.entity import DeviceInfo
+from ._json import loads as json_loads
+from .const import DOMAIN, SIGNAL_NEW_DEVICE, dp_signal
+from .topic_parser import ParsedTopic, TopicParser
 from .sensor_types import (
-    is_sensor_type_register,
-    parse_sensor_name,
-    is_relay_mode_register,
+    DP_GENERIC,
+    DP_KIND_RELAY_MODE,
+    DP_KIND_SENSOR_INPUT,
+    DP_KIND_SENSOR_TYPE,
+    DatapointKind,
+    classify_datapoint,
     decode_relay_value,
+    resolve_unit,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,6 +26,13 @@ _LOGGER = logging.getLogger(__name__)
 STALE_REGISTER_MAX_AGE = 10.0  # Maximum age in seconds for related registers to be considered fresh
 REGISTER_CLEANUP_AGE = 3600.0  # Clean up registers older than 1 hour
 TEMP_UNIT_REGISTER = 521  # Register holding temperature unit setting (0=°C, 1=°F)
+DP_TOPIC_FILTER = "+/device/+/+/+/+/dp/+/+"  # Matches every device datapoint topic
+
+
+@lru_cache(maxsize=256)
+def _parse_format(fmt: str) -> Any:
+    """Parse a datapoint's JSON value format once; the result is shared and must not be modified."""
+    return json_loads(fmt)
 
 class Coordinator:
     """Central coordinator for MQTT message handling, device discovery, and datapoint decoding."""
@@ -34,6 +47,14 @@ class Coordinator:
         self._registers: dict[str, dict[int, Tuple[int, float]]] = defaultdict(dict)
         # Datapoint metadata: device_key -> List[dict]
         self._datapoints: dict[str, List[dict]] = defaultdict(list)
+        # Datapoint metadata by start address: device_key -> { address: dict }
+        self._dp_by_address: dict[str, dict[int, dict]] = {}
+        # Datapoints covering each register: device_key -> { register: [(dp, start, reg_count, length_bytes), ...] }
+        self._dp_by_register: dict[str, dict[int, List[tuple]]] = {}
+        # Datapoint classification: device_key -> { address: DatapointKind }
+        self._dp_kinds: dict[str, dict[int, DatapointKind]] = {}
+        # Resolved metadata units: device_key -> { address: (unit, device_class, state_class) }
+        self._dp_units: dict[str, dict[int, tuple]] = {}
         # Decoded values: device_key -> { datapoint_start_address: decoded_value }
         self._dp_value_cache: dict[str, dict[int, Any]] = defaultdict(dict)
 
@@ -47,15 +68,19 @@ class Coordinator:
         self._parsed_topics: dict[str, ParsedTopic] = {}
         # Full metadata storage: device_key -> full metadata dict (including "meta" section)
         self._full_metadata: dict[str, dict] = {}
+        # Device registry info shared by all entities of a device: device_key -> DeviceInfo
+        self._device_info: dict[str, DeviceInfo] = {}
+        # Topic parser remembering the last device prefix (datapoints arrive grouped by device)
+        self._topic_parser = TopicParser()
 
     async def start(self) -> None:
         """Start the coordinator by subscribing to MQTT topics."""
-        self.mqtt.subscribe("+/device/+/+/+/+/dp/+/+")
+        await self.mqtt.subscribe_many([DP_TOPIC_FILTER])
         _LOGGER.debug("Subscribed to topic wildcard for device datapoints")
 
     async def handle_message(self, topic: str, payload: bytes) -> None:
         """Handle incoming MQTT message: parse topic, discover devices, decode datapoints."""
-        pt = parse_topic(topic)
+        pt = self._topic_parser.parse(topic)
         if not pt:
             _LOGGER.debug("Ignored topic (no match): %s", topic)
             return
@@ -120,8 +145,54 @@ class Coordinator:
     # --- Datapoint Management -------------------------------------------------
 
     def register_datapoints(self, device_key: str, datapoints: List[dict]) -> None:
-        """Register metadata datapoints for a device."""
+        """Register metadata datapoints for a device: index them by address and covered registers, classify them by name and resolve their units once."""
         self._datapoints[device_key] = datapoints
+        self._dp_by_address[device_key] = {int(dp.get("address", -1)): dp for dp in datapoints}
+        dp_by_register: dict[int, List[tuple]] = {}
+        for dp in datapoints:
+            start = int(dp.get("address", -1))
+            if start < 0:
+                continue
+            length_bytes = int(dp.get("length", 0))
+            if length_bytes <= 0:
+                continue
+            reg_count = (length_bytes + 1) // 2
+            entry = (dp, start, reg_count, length_bytes)
+            for register in range(start, start + reg_count):
+                dp_by_register.setdefault(register, []).append(entry)
+        self._dp_by_register[device_key] = dp_by_register
+        self._dp_kinds[device_key] = {
+            int(dp.get("address", -1)): classify_datapoint(dp.get("name", "")) for dp in datapoints
+        }
+        self._dp_units[device_key] = {
+            int(dp.get("address", -1)): info for dp in datapoints if (info := resolve_unit(dp.get("unit"))) is not None
+        }
+
+    def get_dp_kind(self, device_key: str, address: int) -> DatapointKind:
+        """
+        Get the classification of the datapoint at an address.
+
+        Args:
+            device_key: Device identifier (mac::network_id)
+            address: Modbus register address
+
+        Returns:
+            DatapointKind (DP_GENERIC if there is no datapoint at the address)
+        """
+        return self._dp_kinds.get(device_key, {}).get(address, DP_GENERIC)
+
+    def get_dp_unit_info(self, device_key: str, address: int) -> Optional[tuple]:
+        """
+        Get the resolved metadata unit of the datapoint at an address.
+
+        Args:
+            device_key: Device identifier (mac::network_id)
+            address: Modbus register address
+
+        Returns:
+            (unit, device_class, state_class), or None if the datapoint has no unit
+        """
+        return self._dp_units.get(device_key, {}).get(address)
 
     def get_datapoint_value(self, device_key: str, address: int) -> Any:
         """Get decoded value for a specific datapoint address."""
@@ -251,6 +322,26 @@ class Coordinator:
         """
         return self._relay_mode_values.get(device_key, {}).get(relay_name)
 
+    def get_device_info(self, pt: ParsedTopic) -> DeviceInfo:
+        """
+        Get the DeviceInfo for a device, built once and shared by all its entities.
+
+        Args:
+            pt: Parsed topic of the device
+
+        Returns:
+            DeviceInfo for the device registry
+        """
+        device_info = self._device_info.get(pt.device_key)
+        if device_info is None:
+            device_info = self._device_info[pt.device_key] = DeviceInfo(
+                identifiers={(DOMAIN, pt.device_key)},
+                name=pt.device_name,
+                manufacturer=pt.oem_name,
+                model=pt.device_id,
+            )
+        return device_info
+
     def get_dp_at_address(self, device_key: str, address: int) -> Optional[dict]:
         """
         Get datapoint metadata at a specific address.
@@ -262,8 +353,7 @@ class Coordinator:
         Returns:
             Datapoint metadata dict or None if not found
         """
-        datapoints = self._datapoints.get(device_key, [])
-        return next((dp for dp in datapoints if int(dp.get("address", -1)) == address), None)
+        return self._dp_by_address.get(device_key, {}).get(address)
 
     # --- Register Update + Decoding -------------------------------------------
 
@@ -288,26 +378,17 @@ class Coordinator:
             if old_unit is not None and old_unit != value:
                 _LOGGER.info("Temperature unit changed from %s to %s for device %s", old_unit, value, device_key)
 
-        # Check datapoints linearly (optimization possible later)
-        datapoints = self._datapoints.get(device_key, [])
-        for dp in datapoints:
-            start = int(dp.get("address", -1))
-            if start < 0:
-                continue
-            length_bytes = int(dp.get("length", 0))
-            if length_bytes <= 0:
-                continue
-            reg_needed = (length_bytes + 1) // 2
-            if not (start <= address < start + reg_needed):
-                continue
-            # Address matches this datapoint's range
+        # Only the datapoints whose register range covers this address
+        dp_entries = self._dp_by_register.get(device_key, {}).get(address, ())
+        for dp, start, reg_needed, length_bytes in dp_entries:
             dp_name = dp.get("name", "?")
+            dp_kind = self.get_dp_kind(device_key, start)
 
             # Check if this is a sensor type register (e.g., "S1 Type")
-            sensor_name = is_sensor_type_register(dp_name)
+            sensor_name = dp_kind.base_name if dp_kind.kind == DP_KIND_SENSOR_TYPE else None
 
             # Check if this is a relay mode register (e.g., "R1 Mode")
-            relay_name = is_relay_mode_register(dp_name)
+            relay_name = dp_kind.base_name if dp_kind.kind == DP_KIND_RELAY_MODE else None
 
             decoded = self._try_decode_dp(device_key, dp, start, reg_needed, length_bytes)
             if decoded is not None:
@@ -319,8 +400,7 @@ class Coordinator:
 
                     # Check if this is an S<n> sensor without a known type
                     # If so, don't cache - wait until type is known
-                    sensor_num = parse_sensor_name(dp_name)
-                    if sensor_num is not None:
+                    if dp_kind.kind == DP_KIND_SENSOR_INPUT:
                         # This is an S<n> sensor - only cache if type is known
                         type_id = self.get_sensor_type(device_key, dp_name)
                         if type_id is None:
@@ -329,8 +409,7 @@ class Coordinator:
 
                     # Check if address N+1 has a mode register - if so, this is a relay
                     # Use address-based detection instead of name pattern matching
-                    mode_dp = self.get_dp_at_address(device_key, start + 1)
-                    if mode_dp and is_relay_mode_register(mode_dp.get("name", "")):
+                    if self.get_dp_kind(device_key, start + 1).kind == DP_KIND_RELAY_MODE:
                         # This is a relay - lookup mode by this datapoint's actual name
                         mode_id = self.get_relay_mode(device_key, dp_name)
                         if mode_id is None:
@@ -378,11 +457,11 @@ class Coordinator:
                                          start - 1, dp_name, start)
 
                     # Always dispatch signal (even if not cached)
-                    _LOGGER.debug("Dispatching SIGNAL_DP_UPDATE for device=%s, address=%s, value=%s (prev=%s, cached=%s)",
+                    _LOGGER.debug("Dispatching DP update for device=%s, address=%s, value=%s (prev=%s, cached=%s)",
                                  device_key, start, decoded, prev, should_cache)
                     async_dispatcher_send(
                         self.hass,
-                        SIGNAL_DP_UPDATE,
+                        dp_signal(device_key),
                         device_key,
                         start,
                         decoded
@@ -452,7 +531,7 @@ class Coordinator:
                 if dp.get("format", 1) != "":
                     # if given the format is structured like {\r\n    \"0\": \"Off\",\r\n    \"1\": \"Daily\",\r\n    \"2\": \"Weekly\"\r\n}
                     try:
-                        fmt = json.loads(dp.get("format"))
+                        fmt = _parse_format(dp.get("format"))
                         if isinstance(fmt, dict):
                             value_str = str(value)
                             if value_str in fmt:
@@ -520,21 +599,22 @@ class Coordinator:
         # 2. Parse value from payload
         value = None
         try:
-            text = payload.decode("utf-8", errors="ignore").strip()
+            # Parsed straight from the payload bytes, without decoding to str first
+            data = payload.strip()
 
             # Try JSON format: {"value": 123}
-            if text.startswith("{"):
+            if data.startswith(b"{"):
                 try:
-                    obj = json.loads(text)
+                    obj = json_loads(data)
                     if isinstance(obj, dict) and "value" in obj:
                         value = int(obj["value"])
-                except (json.JSONDecodeError, ValueError, KeyError):
+                except (ValueError, TypeError):
                     pass
 
             # Try plain numeric
             if value is None:
                 try:
-                    value = int(text)
+                    value = int(data)
                 except ValueError:
                     pass
 
@@ -9,6 +9,10 @@ import aiofiles
 
 _LOGGER = logging.getLogger(__name__)
 
+# Parsed metadata is kept in memory for this long (seconds), so repeated lookups
+# for the same device type skip reading and parsing the cache file again
+METADATA_MEMORY_TTL = 3600
+
 class MetaClient:
     """
     Client for the Sorel metadata API with caching, poll limiting, and local fallback.
@@ -25,11 +29,21 @@ class MetaClient:
         self._retry_intervals = [300, 600, 1800, 3600]  # 5min, 10min, 30min, 1h
         self._failed_count = {}  # Explicitly initialize
         self._retry_tasks = {}  # Manage active retry tasks
+        self._memory_cache = {}  # (org, dev, lang, fw) -> (expires_at, metadata)
 
     def _cache_path(self, organization_id, device_enum_id, language, firmware_version):
         fname = f"meta_{organization_id}_{device_enum_id}_{language}_{firmware_version}.json"
         return os.path.join(self._cache_dir, fname)
 
+    def _remember(self, key, data):
+        """Keep parsed metadata in memory for METADATA_MEMORY_TTL seconds and return it"""
+        self._memory_cache[key] = (time.monotonic() + METADATA_MEMORY_TTL, data)
+        return data
+
+    def clear_memory_cache(self):
+        """Drop all metadata kept in memory (e.g. after the cache files were deleted)"""
+        self._memory_cache.clear()
+
     def _can_poll(self, key):
         now = time.time()
         last = self._last_poll.get(key, 0)
@@ -171,6 +185,14 @@ class MetaClient:
             _LOGGER.debug(f"Device {key} is permanently marked as unavailable.")
             return None
 
+        # 0. Check memory cache
+        cached = self._memory_cache.get(key)
+        if cached is not None:
+            expires_at, data = cached
+            if expires_at > time.monotonic():
+                return data
+            del self._memory_cache[key]
+
         # 1. Check local cache
         if os.path.exists(cache_file):
             try:
@@ -183,7 +205,7 @@ class MetaClient:
                     return None
                 # Optional: Check validity (e.g., max 7 days old)
                 _LOGGER.info(f"Metadata loaded from cache for {key}.")
-                return data
+                return self._remember(key, data)
             except Exception as e:
                 _LOGGER.warning(f"Error reading metadata cache: {e}")
 
@@ -202,7 +224,7 @@ class MetaClient:
             try:
                 async with aiofiles.open(cache_file, "r", encoding="utf-8") as f:
                     content = await f.read()
-                    return json.loads(content)
+                    return self._remember(key, json.loads(content))
             except Exception as e:
                 _LOGGER.error(f"Error reading freshly saved cache: {e}")
 
@@ -217,7 +239,7 @@ class MetaClient:
                         self._record_permanent_failure(key)
                         return None
                     _LOGGER.info(f"Fallback to old cache for {key}")
-                    return data
+                    return self._remember(key, data)
             except Exception:
                 pass
 
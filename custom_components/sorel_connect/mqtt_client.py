@@ -4,15 +4,16 @@
 """
 
 import asyncio
-import json
+import hashlib
 import logging
 from abc import ABC, abstractmethod
 from typing import Callable, Awaitable, Optional
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HassJob, HomeAssistant, callback
 from homeassistant.components import mqtt as ha_mqtt
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 
+from ._json import encode_payload
 from .mqtt_gateway import MqttGateway
 from .const import SIGNAL_MQTT_CONNECTION_STATE, DOMAIN
 
@@ -22,6 +23,8 @@ _LOGGER = logging.getLogger(__name__)
 class MqttClient(ABC):
     """Abstract MQTT client interface."""
 
+    __slots__ = ()
+
     @abstractmethod
     async def connect(self) -> None:
         """Connect to MQTT broker. Raises ConnectionError if connection fails."""
@@ -33,8 +36,23 @@ class MqttClient(ABC):
         pass
 
     @abstractmethod
-    def publish_json(self, topic: str, payload: dict, retain: bool = True, qos: int = 0) -> None:
-        """Publish JSON payload to MQTT topic."""
+    async def subscribe_many(self, topics: list[str], qos: int = 0) -> None:
+        """Subscribe to several MQTT topics in one go."""
+        pass
+
+    @abstractmethod
+    def unsubscribe(self, topic: str) -> None:
+        """Unsubscribe from an MQTT topic."""
+        pass
+
+    @abstractmethod
+    def publish_json(self, topic: str, payload: dict | bytes, retain: bool = True, qos: int = 0) -> None:
+        """Publish JSON payload to MQTT topic.
+
+        The payload is either a dict, which is serialized to JSON, or JSON that
+        is already serialized (bytes, bytearray or memoryview), which is
+        published unchanged.
+        """
         pass
 
     @property
@@ -52,6 +70,15 @@ class MqttClient(ABC):
 class HaMqttClient(MqttClient):
     """MQTT client using Home Assistant's built-in MQTT integration."""
 
+    __slots__ = (
+        "_hass",
+        "_on_message_job",
+        "_on_connection_change_cb",
+        "_subscriptions",
+        "_pending_subs",
+        "_is_ready",
+    )
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -66,10 +93,14 @@ class HaMqttClient(MqttClient):
             on_connection_change: Optional async callback for connection state changes (connected: bool)
         """
         self._hass = hass
-        self._on_message_cb = on_message
+        # HassJob resolves once whether on_message is a coroutine function or a
+        # @callback, so sync consumers are called without allocating a coroutine
+        self._on_message_job = HassJob(on_message)
         self._on_connection_change_cb = on_connection_change
-        self._subscribed_topics: list[str] = []
-        self._unsubscribe_callbacks: list[Callable[[], None]] = []
+        # Active subscriptions: topic -> unsubscribe callback
+        self._subscriptions: dict[str, Callable[[], None]] = {}
+        # Topics requested before the integration was ready: (topic, qos)
+        self._pending_subs: list[tuple[str, int]] = []
         self._is_ready = False
 
     async def connect(self) -> None:
@@ -87,6 +118,11 @@ class HaMqttClient(MqttClient):
             self._is_ready = True
             _LOGGER.info("Using Home Assistant MQTT integration")
 
+            # Flush subscriptions requested while not ready
+            if self._pending_subs:
+                pending, self._pending_subs = self._pending_subs, []
+                await asyncio.gather(*(self._async_subscribe(topic, qos) for topic, qos in pending))
+
             # Notify connection established
             if self._on_connection_change_cb:
                 await self._on_connection_change_cb(True)
@@ -99,22 +135,18 @@ class HaMqttClient(MqttClient):
 
     @callback
     def _ha_mqtt_message_received(self, msg) -> None:
-        """Handle incoming MQTT message from HA MQTT integration."""
-        topic = msg.topic
-        payload = msg.payload
-
-        # HA MQTT provides payload as string, but our interface expects bytes
-        # Convert to bytes to match paho-mqtt behavior
-        if isinstance(payload, str):
-            payload = payload.encode('utf-8')
+        """Handle incoming MQTT message from HA MQTT integration.
 
-        # Schedule the async callback
-        asyncio.create_task(self._on_message_cb(topic, payload))
+        Subscriptions are made with encoding=None, so the payload is always bytes
+        (matching paho-mqtt behavior).
+        """
+        self._hass.async_run_hass_job(self._on_message_job, msg.topic, msg.payload)
 
     def subscribe(self, topic: str, qos: int = 0) -> None:
         """Subscribe to an MQTT topic using HA MQTT integration."""
         if not self._is_ready:
-            _LOGGER.warning("Cannot subscribe to %s: MQTT not ready", topic)
+            _LOGGER.debug("MQTT not ready, deferring subscription to %s", topic)
+            self._pending_subs.append((topic, qos))
             return
 
         _LOGGER.debug("Subscribing to topic: %s (QoS %d)", topic, qos)
@@ -122,6 +154,16 @@ class HaMqttClient(MqttClient):
         # Schedule the async subscription
         asyncio.create_task(self._async_subscribe(topic, qos))
 
+    async def subscribe_many(self, topics: list[str], qos: int = 0) -> None:
+        """Subscribe to several topics from a single task instead of one task per topic."""
+        if not self._is_ready:
+            _LOGGER.debug("MQTT not ready, deferring subscription to %d topics", len(topics))
+            self._pending_subs.extend((topic, qos) for topic in topics)
+            return
+
+        _LOGGER.debug("Subscribing to %d topics (QoS %d)", len(topics), qos)
+        await asyncio.gather(*(self._async_subscribe(topic, qos) for topic in topics))
+
     async def _async_subscribe(self, topic: str, qos: int = 0) -> None:
         """Async helper for subscribing to topics."""
         try:
@@ -129,15 +171,26 @@ class HaMqttClient(MqttClient):
                 self._hass,
                 topic,
                 self._ha_mqtt_message_received,
-                qos=qos
+                qos=qos,
+                encoding=None,
             )
-            self._subscribed_topics.append(topic)
-            self._unsubscribe_callbacks.append(unsubscribe)
+            self._subscriptions[topic] = unsubscribe
             _LOGGER.info("Subscribed to MQTT topic: %s", topic)
         except Exception as e:
             _LOGGER.error("Failed to subscribe to topic %s: %s", topic, e)
 
-    def publish_json(self, topic: str, payload: dict, retain: bool = True, qos: int = 0) -> None:
+    def unsubscribe(self, topic: str) -> None:
+        """Unsubscribe from an MQTT topic using HA MQTT integration."""
+        self._pending_subs = [(t, qos) for t, qos in self._pending_subs if t != topic]
+        unsubscribe = self._subscriptions.pop(topic, None)
+        if unsubscribe is None:
+            return
+        try:
+            unsubscribe()
+        except Exception as e:
+            _LOGGER.error("Error unsubscribing from %s: %s", topic, e)
+
+    def publish_json(self, topic: str, payload: dict | bytes, retain: bool = True, qos: int = 0) -> None:
         """Publish JSON payload to MQTT topic using HA MQTT integration."""
         if not self._is_ready:
             _LOGGER.warning("Cannot publish to %s: MQTT not ready", topic)
@@ -146,13 +199,13 @@ class HaMqttClient(MqttClient):
         # Schedule the async publish
         asyncio.create_task(self._async_publish_json(topic, payload, retain, qos))
 
-    async def _async_publish_json(self, topic: str, payload: dict, retain: bool = True, qos: int = 0) -> None:
+    async def _async_publish_json(self, topic: str, payload: dict | bytes, retain: bool = True, qos: int = 0) -> None:
         """Async helper for publishing JSON."""
         try:
             await ha_mqtt.async_publish(
                 self._hass,
                 topic,
-                json.dumps(payload),
+                encode_payload(payload),
                 qos=qos,
                 retain=retain
             )
@@ -166,17 +219,17 @@ class HaMqttClient(MqttClient):
 
     def stop(self) -> None:
         """Unsubscribe from all topics and clean up."""
-        _LOGGER.debug("Stopping HA MQTT client, unsubscribing from %d topics", len(self._unsubscribe_callbacks))
+        _LOGGER.debug("Stopping HA MQTT client, unsubscribing from %d topics", len(self._subscriptions))
 
         # Call all unsubscribe callbacks
-        for unsubscribe in self._unsubscribe_callbacks:
+        for unsubscribe in self._subscriptions.values():
             try:
                 unsubscribe()
             except Exception as e:
                 _LOGGER.error("Error unsubscribing: %s", e)
 
-        self._unsubscribe_callbacks.clear()
-        self._subscribed_topics.clear()
+        self._subscriptions.clear()
+        self._pending_subs.clear()
         self._is_ready = False
 
         # Notify disconnection
@@ -184,8 +237,20 @@ class HaMqttClient(MqttClient):
             asyncio.create_task(self._on_connection_change_cb(False))
 
 
+# Broker connections shared by all CustomMqttClient instances:
+# (host, port, username, tls_enabled) -> gateway
+_GATEWAYS: dict[tuple, MqttGateway] = {}
+
+
 class CustomMqttClient(MqttClient):
-    """MQTT client using custom paho-mqtt gateway for external brokers."""
+    """MQTT client using custom paho-mqtt gateway for external brokers.
+
+    Clients pointing at the same broker with the same credentials share one
+    MqttGateway (one TCP/TLS session, driven from the event loop); the gateway
+    is stopped when the last client detaches.
+    """
+
+    __slots__ = ("_gateway", "_gateway_key", "_topic_filters", "_remove_listener", "_on_connection_change_cb")
 
     def __init__(
         self,
@@ -208,25 +273,57 @@ class CustomMqttClient(MqttClient):
             on_message: Async callback for incoming messages (topic, payload)
             on_connection_change: Optional async callback for connection state changes (connected: bool)
         """
-        self._gateway = MqttGateway(
-            host=host,
-            port=port,
-            username=username,
-            password=password,
-            tls_enabled=tls_enabled,
-            on_message=on_message,
-            on_connection_change=on_connection_change,
-        )
+        # Only entries with identical credentials may share a connection; the
+        # password goes into the key as a digest so it is not kept twice in memory
+        password_digest = hashlib.sha256(password.encode()).hexdigest() if password is not None else None
+        self._gateway_key = (host, port, username, password_digest, tls_enabled)
+        gateway = _GATEWAYS.get(self._gateway_key)
+        if gateway is None:
+            gateway = MqttGateway(
+                host=host,
+                port=port,
+                username=username,
+                password=password,
+                tls_enabled=tls_enabled,
+            )
+            _GATEWAYS[self._gateway_key] = gateway
+        else:
+            _LOGGER.debug("Reusing MQTT connection to %s:%s", host, port)
+        self._gateway = gateway
+        self._on_connection_change_cb = on_connection_change
+        self._topic_filters: set[str] = set()
+        self._remove_listener = gateway.add_listener(on_message, on_connection_change, self._topic_filters)
 
     async def connect(self) -> None:
         """Connect to MQTT broker via custom gateway."""
-        await self._gateway.connect()
+        if self._gateway.is_connected:
+            # Shared connection is already up, so the gateway won't report it again
+            if self._on_connection_change_cb:
+                await self._on_connection_change_cb(True)
+            return
+        try:
+            await self._gateway.connect()
+        except Exception:
+            # Don't leave a dead listener (or a dead gateway) behind for the next setup attempt
+            self.stop()
+            raise
 
     def subscribe(self, topic: str, qos: int = 0) -> None:
         """Subscribe to an MQTT topic via custom gateway."""
+        self._topic_filters.add(topic)
         self._gateway.subscribe(topic, qos=qos)
 
-    def publish_json(self, topic: str, payload: dict, retain: bool = True, qos: int = 0) -> None:
+    async def subscribe_many(self, topics: list[str], qos: int = 0) -> None:
+        """Subscribe to several MQTT topics via custom gateway in one request."""
+        self._topic_filters.update(topics)
+        self._gateway.subscribe_many(topics, qos=qos)
+
+    def unsubscribe(self, topic: str) -> None:
+        """Unsubscribe from an MQTT topic via custom gateway."""
+        self._topic_filters.discard(topic)
+        self._gateway.unsubscribe(topic)
+
+    def publish_json(self, topic: str, payload: dict | bytes, retain: bool = True, qos: int = 0) -> None:
         """Publish JSON payload to MQTT topic via custom gateway."""
         self._gateway.publish_json(topic, payload, retain=retain, qos=qos)
 
@@ -236,5 +333,11 @@ class CustomMqttClient(MqttClient):
         return self._gateway.is_connected
 
     def stop(self) -> None:
-        """Stop custom gateway and disconnect."""
+        """Detach from the gateway; stop and disconnect it if this was the last client."""
+        self._remove_listener()
+        if self._gateway.has_listeners:
+            _LOGGER.debug("MQTT connection still in use by another client, keeping it open")
+            return
+        if _GATEWAYS.get(self._gateway_key) is self._gateway:
+            del _GATEWAYS[self._gateway_key]
         self._gateway.stop()
@@ -1,10 +1,14 @@
 import asyncio
-import json
-import ssl
+import contextlib
+import hashlib
 import logging
-import secrets
+import socket
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Awaitable, Optional
 import paho.mqtt.client as mqtt
+from homeassistant.util.ssl import client_context
+
+from ._json import encode_payload
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,6 +20,41 @@ MQTT_ERR_SERVER_UNAVAILABLE = 3
 MQTT_ERR_BAD_USERNAME_PASSWORD = 4
 MQTT_ERR_NOT_AUTHORIZED = 5
 
+MQTT_MAX_INFLIGHT = 100
+
+# Keepalive (seconds) sent to the broker; also bounds half-open detection
+MQTT_KEEPALIVE = 30
+# TCP keepalive probing for the broker socket: idle seconds, interval, probe count
+TCP_KEEPALIVE_IDLE = 30
+TCP_KEEPALIVE_INTERVAL = 10
+TCP_KEEPALIVE_COUNT = 3
+
+# paho is driven from the event loop (no network thread): housekeeping interval
+# for keepalive pings and timeouts, delay between reconnect attempts and the
+# socket timeout (TCP connect, TLS handshake) of a reconnect attempt (seconds)
+MQTT_MISC_INTERVAL = 1
+MQTT_RECONNECT_INTERVAL = 10
+MQTT_RECONNECT_TIMEOUT = 10
+# How long async_stop() waits for DISCONNECT to be flushed and the socket closed
+MQTT_STOP_TIMEOUT = 1
+
+# The blocking socket setup (DNS, TCP and TLS handshake) runs on its own thread so
+# it never occupies one of Home Assistant's shared executor workers
+_CONNECT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sorel-mqtt-connect")
+
+_CLIENT_ID_PREFIX = f"ha-sorel-connect-{socket.gethostname()}"
+
+
+def _client_id(host: str, port: int, username: Optional[str], password: Optional[str], tls_enabled: bool) -> str:
+    """Return a client ID that stays the same across restarts for one broker and set of credentials.
+
+    The session is persistent (clean_session=False), so the broker can only
+    resume it, instead of keeping an orphaned session per restart, if the
+    next connection uses the same ID.
+    """
+    digest = hashlib.sha256(repr((host, port, username, password, tls_enabled)).encode()).hexdigest()
+    return f"{_CLIENT_ID_PREFIX}-{digest[:12]}"
+
 MQTT_ERROR_MESSAGES = {
     MQTT_ERR_UNACCEPTABLE_PROTOCOL_VERSION: "Unacceptable protocol version",
     MQTT_ERR_IDENTIFIER_REJECTED: "Identifier rejected",
@@ -24,8 +63,99 @@ MQTT_ERROR_MESSAGES = {
     MQTT_ERR_NOT_AUTHORIZED: "Not authorized",
 }
 
+
+class _LoopClient(mqtt.Client):
+    """paho client that takes over an already connected socket.
+
+    paho 1.x resolves, connects and handshakes with blocking calls inside
+    reconnect(), and sets up its socket state there. The gateway opens the
+    socket in the connect executor instead and passes it in here, so every
+    paho call, including connect(), runs on the event loop.
+    """
+
+    _prepared_sock: Optional[socket.socket] = None
+
+    def connect_socket(self, sock: socket.socket, host: str, port: int, keepalive: int) -> int:
+        """Start the MQTT session on sock, which is already connected to host:port."""
+        self._prepared_sock = sock
+        try:
+            return self.connect(host, port, keepalive)
+        finally:
+            if self._prepared_sock is not None:
+                # connect() failed before taking the socket over
+                self._prepared_sock.close()
+                self._prepared_sock = None
+
+    def _create_socket_connection(self):
+        sock, self._prepared_sock = self._prepared_sock, None
+        if sock is None:
+            raise OSError("No broker socket prepared")
+        return sock
+
+
+def _close_socket_result(future: asyncio.Future) -> None:
+    """Close the socket of an abandoned connect attempt once it is open."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class _Listener:
+    """A consumer registered on a (possibly shared) gateway."""
+
+    __slots__ = ("on_message", "is_async", "on_connection_change", "topic_filters")
+
+    def __init__(
+        self,
+        on_message: Callable[[str, bytes], Awaitable[None]],
+        on_connection_change: Optional[Callable[[bool], Awaitable[None]]],
+        topic_filters: Optional[set[str]],
+    ) -> None:
+        self.on_message = on_message
+        # Sync callbacks are scheduled directly instead of wrapping them in a coroutine
+        self.is_async = asyncio.iscoroutinefunction(on_message)
+        self.on_connection_change = on_connection_change
+        # Filters this listener subscribed to; None means "every message"
+        self.topic_filters = topic_filters
+
+    def wants(self, topic: str) -> bool:
+        """Return True if the topic matches one of this listener's subscriptions."""
+        if self.topic_filters is None:
+            return True
+        return any(mqtt.topic_matches_sub(sub, topic) for sub in self.topic_filters)
+
+
 class MqttGateway:
-    """MQTT Gateway with async support using paho-mqtt."""
+    """MQTT Gateway with async support using paho-mqtt.
+
+    One gateway holds one broker connection and can be shared by several
+    listeners (see CustomMqttClient); messages are fanned out to every
+    listener whose subscriptions match the topic.
+
+    The paho client has no network thread: its socket is registered with the
+    event loop, so reads, writes and all paho calls and callbacks run on the
+    loop. Only opening the socket (DNS, TCP and TLS handshake) is done in an
+    executor, without touching the paho client.
+    """
+
+    __slots__ = (
+        "_host",
+        "_port",
+        "_username",
+        "_password",
+        "_tls_enabled",
+        "_ssl_context",
+        "_listeners",
+        "_subscriptions",
+        "_client",
+        "_loop",
+        "_connect_future",
+        "_is_connected",
+        "_reconnect_count",
+        "_misc_timer",
+        "_reconnect_task",
+        "_stopped",
+        "_socket_closed",
+    )
 
     def __init__(
         self,
@@ -34,46 +164,117 @@ class MqttGateway:
         username: Optional[str],
         password: Optional[str],
         tls_enabled: bool,
-        on_message: Callable[[str, bytes], Awaitable[None]],
+        on_message: Optional[Callable[[str, bytes], Awaitable[None]]] = None,
         on_connection_change: Optional[Callable[[bool], Awaitable[None]]] = None,
+        persistent: bool = True,
     ) -> None:
+        """Set up the gateway; persistent=False uses a throwaway clean session (e.g. a connection test)."""
         self._host = host
         self._port = port
         self._username = username
         self._password = password
         self._tls_enabled = tls_enabled
-        self._on_message_cb = on_message
-        self._on_connection_change_cb = on_connection_change
-        # Generate unique client ID to avoid conflicts between multiple instances
-        unique_suffix = secrets.token_hex(4)
-        self._client = mqtt.Client(client_id=f"ha-sorel-connect-{unique_suffix}", clean_session=True)
+        # Copy-on-write tuple: listeners may be added or removed while a message is dispatched
+        self._listeners: tuple[_Listener, ...] = ()
+        if on_message:
+            self.add_listener(on_message, on_connection_change)
+        # Subscriptions made through this gateway: topic -> qos
+        self._subscriptions: dict[str, int] = {}
+        # Persistent session: the broker keeps our subscriptions across reconnects
+        # and restarts. A throwaway connection gets its own ID, so it never takes
+        # over (or resumes) the session of a running gateway.
+        client_id = _client_id(host, port, username, password, tls_enabled)
+        self._client = _LoopClient(
+            client_id=client_id if persistent else f"{client_id}-probe",
+            clean_session=not persistent,
+            transport="tcp",
+        )
+        # Keep paho's per-packet bookkeeping out of the message path: no logger
+        # forwarding, a larger in-flight window and no artificial queue limit.
+        self._client.disable_logger()
+        self._client.max_inflight_messages_set(MQTT_MAX_INFLIGHT)
+        self._client.max_queued_messages_set(0)
         if username:
             self._client.username_pw_set(username, password)
-        if tls_enabled:
-            self._client.tls_set(cert_reqs=ssl.CERT_REQUIRED)
+        # TLS is set up by the gateway when it opens the socket, not by paho.
+        # Reuse Home Assistant's cached client context (CERT_REQUIRED) instead
+        # of loading the system certificate store for every gateway.
+        self._ssl_context = client_context() if tls_enabled else None
         self._loop = asyncio.get_running_loop()
         self._connect_future: Optional[asyncio.Future] = None
         self._is_connected: bool = False
         self._reconnect_count: int = 0
+        self._misc_timer: Optional[asyncio.TimerHandle] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopped: bool = False
+        # Set while paho has no open socket
+        self._socket_closed = asyncio.Event()
+        self._socket_closed.set()
 
         self._client.on_connect = self._on_connect
         self._client.on_message = self._on_paho_message
         self._client.on_disconnect = self._on_disconnect
+        self._client.on_socket_open = self._on_socket_open
+        self._client.on_socket_close = self._on_socket_close
+        self._client.on_socket_register_write = self._on_socket_register_write
+        self._client.on_socket_unregister_write = self._on_socket_unregister_write
+
+    def add_listener(
+        self,
+        on_message: Callable[[str, bytes], Awaitable[None]],
+        on_connection_change: Optional[Callable[[bool], Awaitable[None]]] = None,
+        topic_filters: Optional[set[str]] = None,
+    ) -> Callable[[], None]:
+        """
+        Register a message consumer on this gateway.
+
+        Args:
+            on_message: Callback for incoming messages (topic, payload)
+            on_connection_change: Optional async callback for connection state changes
+            topic_filters: Subscriptions owned by this listener (kept up to date by
+                the caller); None delivers every message
+
+        Returns:
+            Function that removes the listener again
+        """
+        listener = _Listener(on_message, on_connection_change, topic_filters)
+        self._listeners = (*self._listeners, listener)
+
+        def remove() -> None:
+            self._listeners = tuple(item for item in self._listeners if item is not listener)
+
+        return remove
+
+    @property
+    def has_listeners(self) -> bool:
+        """Return True while at least one consumer is attached."""
+        return bool(self._listeners)
 
     async def connect(self, timeout: float = 10.0) -> None:
         """Connect to MQTT broker with timeout. Raises ConnectionError if connection fails."""
+        if self._is_connected:
+            return  # Shared gateway already connected by another client
+        if self._connect_future and not self._connect_future.done():
+            # Another client is connecting this gateway right now, wait for its result
+            await asyncio.shield(self._connect_future)
+            return
+
         self._connect_future = self._loop.create_future()
 
         try:
-            await self._loop.run_in_executor(None, self._client.connect, self._host, self._port, 60)
-            self._client.loop_start()
+            await self._connect_socket(timeout)
 
-            # Wait for connection callback with timeout
+            # Wait for connection callback; a plain timer handle enforces the deadline
+            deadline = self._loop.call_later(timeout, self._on_connect_deadline, self._connect_future)
             try:
-                await asyncio.wait_for(self._connect_future, timeout=timeout)
+                await self._connect_future
             except asyncio.TimeoutError:
-                self._client.loop_stop()
+                # Only abandon this attempt; stopping the (possibly shared) gateway
+                # is left to the last client that detaches from it
+                self._client.disconnect()
                 raise ConnectionError(f"Connection to MQTT broker {self._host}:{self._port} timed out after {timeout}s")
+            finally:
+                deadline.cancel()
 
         except Exception as e:
             if self._connect_future and not self._connect_future.done():
@@ -81,6 +282,96 @@ class MqttGateway:
             self._connect_future = None
             raise
 
+    @staticmethod
+    def _on_connect_deadline(future: asyncio.Future) -> None:
+        """Fail the pending connect future once the connect timeout has passed."""
+        if not future.done():
+            future.set_exception(asyncio.TimeoutError())
+
+    async def _connect_socket(self, timeout: float) -> None:
+        """Open the broker socket in the connect executor, then start the MQTT session on it."""
+        future = self._loop.run_in_executor(_CONNECT_EXECUTOR, self._open_socket, timeout)
+        try:
+            sock = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The executor cannot be interrupted; close the socket once it is there
+            future.add_done_callback(_close_socket_result)
+            raise
+        if self._stopped:
+            sock.close()
+            raise ConnectionError("MQTT gateway was stopped while connecting")
+        self._client.connect_socket(sock, self._host, self._port, MQTT_KEEPALIVE)
+
+    def _open_socket(self, timeout: float) -> socket.socket:
+        """Connect (and TLS handshake) to the broker; runs in the connect executor and never touches paho."""
+        sock = socket.create_connection((self._host, self._port), timeout=timeout)
+        try:
+            try:
+                # No Nagle delay on publishes, kernel keepalive probes
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                # Probe timing options are platform specific, set the ones this platform has
+                for option, value in (
+                    ("TCP_KEEPIDLE", TCP_KEEPALIVE_IDLE),
+                    ("TCP_KEEPINTVL", TCP_KEEPALIVE_INTERVAL),
+                    ("TCP_KEEPCNT", TCP_KEEPALIVE_COUNT),
+                ):
+                    if hasattr(socket, option):
+                        sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+            except OSError as e:
+                _LOGGER.debug("Could not set socket options on MQTT connection: %s", e)
+            if self._ssl_context is not None:
+                sock = self._ssl_context.wrap_socket(sock, server_hostname=self._host)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def _on_socket_open(self, client, userdata, sock) -> None:
+        """Start reading the broker socket and paho's housekeeping.
+
+        The queued CONNECT packet is flushed by the writer that paho registers
+        for it; writing it here would clear paho's write registration before
+        that writer is added, leaving it armed on an idle socket.
+        """
+        self._socket_closed.clear()
+        self._loop.add_reader(sock, self._on_readable)
+        if self._misc_timer is None:
+            self._misc_timer = self._loop.call_later(MQTT_MISC_INTERVAL, self._on_misc_timer)
+
+    def _on_socket_close(self, client, userdata, sock) -> None:
+        """Stop watching the broker socket (paho calls this right before closing it)."""
+        self._loop.remove_reader(sock)
+        if self._misc_timer is not None:
+            self._misc_timer.cancel()
+            self._misc_timer = None
+        self._socket_closed.set()
+
+    def _on_socket_register_write(self, client, userdata, sock) -> None:
+        """Watch the socket for writability while paho has outgoing data."""
+        self._loop.add_writer(sock, client.loop_write)
+
+    def _on_socket_unregister_write(self, client, userdata, sock) -> None:
+        """Stop watching for writability once paho's outgoing queue is empty."""
+        self._loop.remove_writer(sock)
+
+    def _on_readable(self) -> None:
+        client = self._client
+        rc = client.loop_read()
+        # TLS may already have decrypted further records into its buffer; the
+        # socket does not become readable again for those, so drain them here
+        sock = client.socket()
+        pending = getattr(sock, "pending", None)
+        while rc == mqtt.MQTT_ERR_SUCCESS and pending is not None and client.socket() is sock and pending():
+            rc = client.loop_read()
+
+    def _on_misc_timer(self) -> None:
+        """Run paho's periodic work (keepalive pings, timeouts) while the socket is open."""
+        if self._client.loop_misc() == mqtt.MQTT_ERR_SUCCESS:
+            self._misc_timer = self._loop.call_later(MQTT_MISC_INTERVAL, self._on_misc_timer)
+        else:
+            self._misc_timer = None
+
     def _on_connect(self, client, userdata, flags, rc):
         if rc == 0:
             was_reconnect = self._reconnect_count > 0
@@ -92,22 +383,25 @@ class MqttGateway:
 
             self._is_connected = True
 
+            # Only resubscribe if the broker did not keep our session
+            if was_reconnect and self._subscriptions and not flags.get("session present"):
+                _LOGGER.debug("Broker session not resumed, resubscribing to %d topics", len(self._subscriptions))
+                # One SUBSCRIBE packet for all of them
+                client.subscribe(list(self._subscriptions.items()))
+
             # Notify about connection state change
-            if self._on_connection_change_cb:
-                asyncio.run_coroutine_threadsafe(
-                    self._on_connection_change_cb(True),
-                    self._loop
-                )
+            self._notify_connection_change(True)
 
-            if self._connect_future and not self._connect_future.done():
-                self._connect_future.set_result(True)
+            if self._connect_future:
+                self._resolve_connect(self._connect_future, None)
         else:
             error_msg = MQTT_ERROR_MESSAGES.get(rc, f"Unknown error (code {rc})")
             _LOGGER.error("MQTT connect failed rc=%s: %s", rc, error_msg)
             self._is_connected = False
-            if self._connect_future and not self._connect_future.done():
-                self._connect_future.set_exception(
-                    ConnectionError(f"MQTT connection failed: {error_msg} (rc={rc})")
+            if self._connect_future:
+                self._resolve_connect(
+                    self._connect_future,
+                    ConnectionError(f"MQTT connection failed: {error_msg} (rc={rc})"),
                 )
 
     def _on_disconnect(self, client, userdata, rc):
@@ -119,25 +413,82 @@ class MqttGateway:
         else:
             _LOGGER.warning("MQTT disconnected unexpectedly (rc=%s), will auto-reconnect", rc)
             self._reconnect_count += 1
+            if not self._stopped and (self._reconnect_task is None or self._reconnect_task.done()):
+                self._reconnect_task = self._loop.create_task(self._reconnect())
 
         # Notify about connection state change (only if we were actually connected)
-        if was_connected and self._on_connection_change_cb:
-            asyncio.run_coroutine_threadsafe(
-                self._on_connection_change_cb(False),
-                self._loop
-            )
+        if was_connected:
+            self._notify_connection_change(False)
+
+    async def _reconnect(self) -> None:
+        """Reconnect to the broker until the connection is back (the socket reopens on success)."""
+        while not self._stopped:
+            await asyncio.sleep(MQTT_RECONNECT_INTERVAL)
+            try:
+                await self._connect_socket(MQTT_RECONNECT_TIMEOUT)
+                return
+            except OSError as e:
+                _LOGGER.debug("MQTT reconnect to %s:%s failed: %s", self._host, self._port, e)
+
+    @staticmethod
+    def _resolve_connect(future: asyncio.Future, error: Optional[Exception]) -> None:
+        """Complete the pending connect future."""
+        if future.done():
+            return
+        if error is None:
+            future.set_result(True)
+        else:
+            future.set_exception(error)
+
+    def _notify_connection_change(self, connected: bool) -> None:
+        """Schedule every listener's connection-change callback."""
+        for listener in self._listeners:
+            if listener.on_connection_change:
+                self._loop.create_task(listener.on_connection_change(connected))
 
     def _on_paho_message(self, client, userdata, msg) -> None:
-        """Handle incoming MQTT message and pass to async callback."""
-        asyncio.run_coroutine_threadsafe(self._on_message_cb(msg.topic, msg.payload), self._loop)
+        """Pass an incoming MQTT message to the matching listeners.
+
+        Async callbacks become plain tasks; sync callbacks run inline.
+        """
+        topic = msg.topic
+        payload = msg.payload
+        listeners = self._listeners
+        for listener in listeners:
+            # A gateway that is not shared skips the subscription matching
+            if len(listeners) > 1 and not listener.wants(topic):
+                continue
+            if listener.is_async:
+                self._loop.create_task(listener.on_message(topic, payload))
+            else:
+                listener.on_message(topic, payload)
 
     def subscribe(self, topic: str, qos: int = 0) -> None:
         """Subscribe to an MQTT topic."""
+        self._subscriptions[topic] = qos
         self._client.subscribe(topic, qos=qos)
 
-    def publish_json(self, topic: str, payload: dict, retain: bool = True, qos: int = 0) -> None:
+    def subscribe_many(self, topics: list[str], qos: int = 0) -> None:
+        """Subscribe to several MQTT topics with a single SUBSCRIBE packet."""
+        if not topics:
+            return
+        for topic in topics:
+            self._subscriptions[topic] = qos
+        self._client.subscribe([(topic, qos) for topic in topics])
+
+    def unsubscribe(self, topic: str) -> None:
+        """Unsubscribe from an MQTT topic unless another listener still uses it."""
+        if any(
+            listener.topic_filters is not None and topic in listener.topic_filters
+            for listener in self._listeners
+        ):
+            return
+        if self._subscriptions.pop(topic, None) is not None:
+            self._client.unsubscribe(topic)
+
+    def publish_json(self, topic: str, payload: dict | bytes, retain: bool = True, qos: int = 0) -> None:
         """Publish JSON payload to MQTT topic."""
-        self._client.publish(topic, json.dumps(payload), qos=qos, retain=retain)
+        self._client.publish(topic, encode_payload(payload), qos=qos, retain=retain)
 
     @property
     def is_connected(self) -> bool:
@@ -146,5 +497,21 @@ class MqttGateway:
 
     def stop(self) -> None:
         """Stop MQTT client and disconnect."""
-        self._client.loop_stop()
+        self._stopped = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        # Queues DISCONNECT; the socket is closed once the loop has written it
         self._client.disconnect()
+
+    async def async_stop(self) -> None:
+        """Stop the gateway and wait for the reconnect task to end and the socket to close."""
+        reconnect_task = self._reconnect_task
+        self.stop()
+        if reconnect_task is not None:
+            with contextlib.suppress(asyncio.CancelledError):
+                await reconnect_task
+        try:
+            await asyncio.wait_for(self._socket_closed.wait(), MQTT_STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            _LOGGER.debug("MQTT socket to %s:%s not closed after %ss", self._host, self._port, MQTT_STOP_TIMEOUT)
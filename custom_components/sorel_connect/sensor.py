@@ -1,25 +1,25 @@
 from __future__ import annotations
 import logging
-from homeassistant.core import HomeAssistant, callback
+from functools import lru_cache
+from types import MappingProxyType
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.components.sensor import (
     SensorEntity,
-    SensorDeviceClass,
     SensorStateClass,
 )
-from homeassistant.const import EntityCategory, PERCENTAGE, UnitOfTemperature, UnitOfPower, UnitOfEnergy, UnitOfElectricPotential, UnitOfElectricCurrent, UnitOfFrequency, UnitOfPressure, UnitOfVolume
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.const import EntityCategory, PERCENTAGE
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers import entity_registry as er
 
-from .const import DOMAIN, SIGNAL_NEW_DEVICE, SIGNAL_DP_UPDATE
+from .const import DOMAIN, SIGNAL_NEW_DEVICE, dp_signal
 from .topic_parser import ParsedTopic
 from .sensor_types import (
-    parse_sensor_name,
+    DP_KIND_RELAY_MODE,
+    DP_KIND_SENSOR_INPUT,
+    DP_KIND_SENSOR_TYPE,
     get_sensor_config,
-    is_sensor_type_register,
-    is_relay_mode_register,
     get_relay_mode_name,
     get_relay_config,
 )
@@ -28,49 +28,17 @@ _LOGGER = logging.getLogger(__name__)
 
 PLATFORM = "sensor"
 
-# Optional mapping from raw strings to HA standard units
-UNIT_MAP = {
-    "°C": UnitOfTemperature.CELSIUS,
-    "C": UnitOfTemperature.CELSIUS,
-    "K": UnitOfTemperature.KELVIN,
-    "°F": UnitOfTemperature.FAHRENHEIT,
-    "%": PERCENTAGE,
-    "W": UnitOfPower.WATT,
-    "kW": UnitOfPower.KILO_WATT,
-    "Wh": UnitOfEnergy.WATT_HOUR,
-    "kWh": UnitOfEnergy.KILO_WATT_HOUR,
-    "V": UnitOfElectricPotential.VOLT,
-    "A": UnitOfElectricCurrent.AMPERE,
-    "Hz": UnitOfFrequency.HERTZ,
-    "bar": UnitOfPressure.BAR,
-    "m³": UnitOfVolume.CUBIC_METERS,
-    "l": UnitOfVolume.LITERS,
-    "L": UnitOfVolume.LITERS,
-}
-
-# Mapping for device_class based on (already mapped) unit
-DEVICE_CLASS_BY_UNIT = {
-    UnitOfTemperature.CELSIUS: SensorDeviceClass.TEMPERATURE,
-    UnitOfTemperature.FAHRENHEIT: SensorDeviceClass.TEMPERATURE,
-    UnitOfTemperature.KELVIN: SensorDeviceClass.TEMPERATURE,
-    UnitOfPower.WATT: SensorDeviceClass.POWER,
-    UnitOfPower.KILO_WATT: SensorDeviceClass.POWER,
-    UnitOfEnergy.WATT_HOUR: SensorDeviceClass.ENERGY,
-    UnitOfEnergy.KILO_WATT_HOUR: SensorDeviceClass.ENERGY,
-    UnitOfElectricPotential.VOLT: SensorDeviceClass.VOLTAGE,
-    UnitOfElectricCurrent.AMPERE: SensorDeviceClass.CURRENT,
-    UnitOfFrequency.HERTZ: SensorDeviceClass.FREQUENCY,
-    UnitOfPressure.BAR: SensorDeviceClass.PRESSURE,
-    UnitOfVolume.LITERS: SensorDeviceClass.VOLUME,
-    UnitOfVolume.CUBIC_METERS: SensorDeviceClass.VOLUME,
-}
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN].setdefault("meta_datapoints", {})
+    hass.data[DOMAIN].setdefault("meta_datapoints", {})  # key: device_key -> {address: dp}
     # Store ParsedTopic instances and already created datapoint sensors
     hass.data[DOMAIN].setdefault("parsed_topics", {})
-    hass.data[DOMAIN].setdefault("dp_sensors", {})  # key: f"{device_key}:{address}" -> Entity
+    dp_sensors = hass.data[DOMAIN].setdefault("dp_sensors", {})  # key: (device_key, address) -> Entity
+    # Value handlers of added datapoint sensors: (device_key, address) -> callback(value)
+    dp_callbacks = hass.data[DOMAIN].setdefault("dp_callbacks", {})
+    # S<n> inputs waiting for their type register: device_key -> {address: (sensor_name, last value)}
+    pending_typed = hass.data[DOMAIN].setdefault("pending_typed", {})
 
     @callback
     def _on_new_device(pt: ParsedTopic):
@@ -83,42 +51,95 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         _LOGGER.debug("Device %s has %d datapoints in metadata", pt.device_key, len(datapoints))
 
         # Store references for later datapoint sensor creation
-        hass.data[DOMAIN]["meta_datapoints"][pt.device_key] = datapoints
+        # Indexed by address so value arrivals look up their metadata directly
+        hass.data[DOMAIN]["meta_datapoints"][pt.device_key] = {
+            int(d.get("address", -1)): d for d in datapoints
+        }
         hass.data[DOMAIN]["parsed_topics"][pt.device_key] = pt
 
         # Only create base diagnostic sensors immediately
         entities = [
-            DeviceTypeSensor(pt),
-            OemIdSensor(pt),
-            NetworkIdSensor(pt),
+            DeviceTypeSensor(pt, coordinator),
+            OemIdSensor(pt, coordinator),
+            NetworkIdSensor(pt, coordinator),
         ]
         _LOGGER.info("Creating %d diagnostic sensors for device %s (%s)", len(entities), pt.device_key, pt.device_name)
         async_add_entities(entities, update_before_add=False)
 
+        # Listen for this device's DP updates
+        entry.async_on_unload(async_dispatcher_connect(hass, dp_signal(pt.device_key), _on_dp_first_value))
+
     # Dispatcher for new devices
     unsub_new = async_dispatcher_connect(hass, SIGNAL_NEW_DEVICE, _on_new_device)
     entry.async_on_unload(unsub_new)
 
-    # One-time dispatcher for DP updates -> creates sensor on first value
+    # Sensors created during one event-loop tick are added to HA in a single call
+    pending: list[SensorEntity] = []
+    flush_scheduled = False
+
+    @callback
+    def _flush_pending():
+        nonlocal flush_scheduled
+        batch = pending.copy()
+        pending.clear()
+        flush_scheduled = False
+        _LOGGER.debug("Adding %d datapoint sensors", len(batch))
+        async_add_entities(batch, update_before_add=False)
+
+    @callback
+    def _queue_add(sensor: SensorEntity):
+        nonlocal flush_scheduled
+        pending.append(sensor)
+        if not flush_scheduled:
+            flush_scheduled = True
+            hass.loop.call_soon(_flush_pending)
+
+    # DP update handler (connected per device): routes the value to the sensor
+    # for this address, or creates the sensor on first value
     @callback
     def _on_dp_first_value(device_key, address, value):
-        _LOGGER.debug("Received SIGNAL_DP_UPDATE: device=%s, address=%s, value=%s", device_key, address, value)
+        _LOGGER.debug("Received DP update: device=%s, address=%s, value=%s", device_key, address, value)
+        key = (device_key, address)
+        cb = dp_callbacks.get(key)
+        if cb is not None:
+            cb(value)
+        # A sensor that is created but not added yet needs nothing from here
+        elif key not in dp_sensors:
+            waiting = pending_typed.get(device_key)
+            if waiting and address in waiting:
+                # Still waiting for the sensor type, just remember the latest value
+                if value is not None:
+                    waiting[address] = (waiting[address][0], value)
+                return
+            _create_dp_sensor(device_key, address, value)
+
+        # A sensor type register update may unblock S<n> inputs waiting for their type
+        waiting = pending_typed.get(device_key)
+        if waiting:
+            coordinator = hass.data[DOMAIN]["coordinator"]
+            if coordinator.get_dp_kind(device_key, address).kind == DP_KIND_SENSOR_TYPE:
+                ready = [
+                    waiting_address for waiting_address, (sensor_name, _) in waiting.items()
+                    if coordinator.get_sensor_type(device_key, sensor_name) is not None
+                ]
+                for waiting_address in ready:
+                    _, last_value = waiting.pop(waiting_address)
+                    _create_dp_sensor(device_key, waiting_address, last_value)
+
+    @callback
+    def _create_dp_sensor(device_key, address, value):
         if value is None:
             _LOGGER.debug("Ignoring DP update with None value for device=%s, address=%s", device_key, address)
             return  # Ignore until real value arrives
-        key = f"{device_key}:{address}"
-        dp_sensors = hass.data[DOMAIN]["dp_sensors"]
-        if key in dp_sensors:
-            _LOGGER.debug("Sensor already exists for %s, skipping creation", key)
-            return  # Sensor already exists, its own handler will take care of it
+        key = (device_key, address)
         pt = hass.data[DOMAIN]["parsed_topics"].get(device_key)
         if not pt:
             _LOGGER.warning("Device %s not fully registered yet, cannot create sensor for address %s", device_key, address)
             return  # Device not fully registered yet
 
         # Find metadata for this datapoint
-        dps_meta = hass.data[DOMAIN]["meta_datapoints"].get(device_key, [])
-        dp_meta = next((d for d in dps_meta if int(d.get("address")) == address), None)
+        dps_meta = hass.data[DOMAIN]["meta_datapoints"].get(device_key, {})
+        dp_meta = dps_meta.get(address)
         if dp_meta is None:
             _LOGGER.debug("No metadata found for address %s, skipping sensor creation", address)
             return  # Skip if no metadata
@@ -127,12 +148,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         _LOGGER.debug("Found metadata for address %s: %s", address, sensor_name)
 
         coordinator = hass.data[DOMAIN]["coordinator"]
+        dp_kind = coordinator.get_dp_kind(device_key, address)
 
         # Check if this is a relay mode register (R1 Mode, R2 Mode, etc.)
-        relay_name = is_relay_mode_register(sensor_name)
-        if relay_name:
+        if dp_kind.kind == DP_KIND_RELAY_MODE:
             # This is a Mode register - get relay at address N-1 to determine proper naming
-            relay_dp_meta = next((d for d in dps_meta if int(d.get("address")) == address - 1), None)
+            relay_dp_meta = dps_meta.get(address - 1)
             if relay_dp_meta:
                 actual_relay_name = relay_dp_meta.get("name", "")
                 _LOGGER.info("Creating diagnostic sensor for Relay Mode: %s (address=%s) -> renamed to '%s Mode' based on relay at address %s",
@@ -144,37 +165,35 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
                             sensor_name, address, address - 1)
                 sensor = RelayModeDiagnosticSensor(pt, dp_meta, coordinator, initial_value=value)
             dp_sensors[key] = sensor
-            async_add_entities([sensor], update_before_add=False)
+            _queue_add(sensor)
             return
 
         # Check if this is a sensor type register (S1 Type, S2 Type, etc.)
-        base_sensor_name = is_sensor_type_register(sensor_name)
-        if base_sensor_name:
+        if dp_kind.kind == DP_KIND_SENSOR_TYPE:
             # This is a Type register - create diagnostic sensor
             _LOGGER.info("Creating diagnostic sensor for Type register: %s (address=%s)", sensor_name, address)
             sensor = SensorTypeDiagnosticSensor(pt, dp_meta, coordinator, initial_value=value)
             dp_sensors[key] = sensor
-            async_add_entities([sensor], update_before_add=False)
+            _queue_add(sensor)
             return
 
         # Check if this is a sensor input (S1, S2, etc.)
-        sensor_num = parse_sensor_name(sensor_name)
-        if sensor_num is not None:
+        if dp_kind.kind == DP_KIND_SENSOR_INPUT:
             # This is a sensor input - check if we know its type yet
             type_id = coordinator.get_sensor_type(device_key, sensor_name)
 
             if type_id is None:
-                _LOGGER.debug("Sensor %s type not yet known for device %s, skipping creation until next update",
+                _LOGGER.debug("Sensor %s type not yet known for device %s, deferring creation until the type arrives",
                              sensor_name, device_key)
-                return  # Skip creation, will retry on next value arrival
+                pending_typed.setdefault(device_key, {})[address] = (sensor_name, value)
+                return  # Created once its type register reports a value
 
             _LOGGER.info("Sensor %s has type_id=%s, creating sensor with proper configuration",
                         sensor_name, type_id)
 
         # Check if address N+1 has a mode register - if so, this is a relay
         # Use address-based detection instead of name pattern matching
-        mode_dp_meta = next((d for d in dps_meta if int(d.get("address")) == address + 1), None)
-        if mode_dp_meta and is_relay_mode_register(mode_dp_meta.get("name", "")):
+        if coordinator.get_dp_kind(device_key, address + 1).kind == DP_KIND_RELAY_MODE:
             # This is a relay - check if it's binary mode
             mode_id = coordinator.get_relay_mode(device_key, sensor_name)
 
@@ -185,48 +204,56 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
             # Check if relay is in binary mode
             config = get_relay_config(mode_id)
-            if config['is_binary']:
+            if config.is_binary:
                 _LOGGER.debug("Relay %s is binary mode (mode=%s), skipping sensor creation (will be created in binary_sensor platform)",
-                             sensor_name, config['mode_name'])
+                             sensor_name, config.mode_name)
                 return  # Skip creation, binary_sensor platform will handle it
 
             _LOGGER.info("Relay %s has mode_id=%s (%s), creating sensor with proper configuration",
-                        sensor_name, mode_id, config['mode_name'])
+                        sensor_name, mode_id, config.mode_name)
 
         sensor = DatapointSensor(pt, dp_meta, coordinator, initial_value=value)
         dp_sensors[key] = sensor
         _LOGGER.info("Creating datapoint sensor for device=%s, address=%s, name='%s'", device_key, address, sensor_name)
-        async_add_entities([sensor], update_before_add=False)
+        _queue_add(sensor)
+
+@callback
+def _register_dp_callback(hass: HomeAssistant, device_key: str, address: int, on_value) -> CALLBACK_TYPE:
+    """Route DP update values for one datapoint to on_value; returns the unregister function."""
+    dp_callbacks = hass.data[DOMAIN]["dp_callbacks"]
+    key = (device_key, address)
+    dp_callbacks[key] = on_value
 
-    unsub_dp = async_dispatcher_connect(hass, SIGNAL_DP_UPDATE, _on_dp_first_value)
-    entry.async_on_unload(unsub_dp)
+    @callback
+    def _unregister() -> None:
+        if dp_callbacks.get(key) == on_value:
+            del dp_callbacks[key]
+
+    return _unregister
+
+@lru_cache(maxsize=64)
+def _device_attributes(pt: ParsedTopic) -> MappingProxyType:
+    """Topic attributes of a device, built once and shared by its diagnostic sensors."""
+    return MappingProxyType({
+        "oem_name": pt.oem_name,
+        "oem_id": pt.oem_id,
+        "mac": pt.mac,
+        "tag": pt.tag,
+        "network_id": pt.network_id,
+        "device_name": pt.device_name,
+        "device_id": pt.device_id,
+        "unit_id": pt.unit_id,
+    })
 
 class BaseDeviceDiagSensor(SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_should_poll = False
 
-    def __init__(self, pt: ParsedTopic):
+    def __init__(self, pt: ParsedTopic, coordinator):
         self._pt = pt
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, pt.device_key)},
-            name=pt.device_name,
-            manufacturer=pt.oem_name,
-            model=pt.device_id,
-        )
+        self._attr_device_info = coordinator.get_device_info(pt)
         self._attr_unique_id = f"{pt.device_key}::{self.__class__.__name__}".lower()
-
-    @property
-    def extra_state_attributes(self):
-        return {
-            "oem_name": self._pt.oem_name,
-            "oem_id": self._pt.oem_id,
-            "mac": self._pt.mac,
-            "tag": self._pt.tag,
-            "network_id": self._pt.network_id,
-            "device_name": self._pt.device_name,
-            "device_id": self._pt.device_id,
-            "unit_id": self._pt.unit_id,
-        }
+        self._attr_extra_state_attributes = _device_attributes(pt)
 
 class DeviceTypeSensor(BaseDeviceDiagSensor):
     _attr_name = "Device Type"
@@ -261,47 +288,42 @@ class SensorTypeDiagnosticSensor(SensorEntity):
         self._coordinator = coordinator
         self._address = int(dp.get("address"))
         self._attr_name = dp.get("name", f"Datapoint {self._address}")
-        self._attr_unique_id = f"{pt.device_key}::dp_{self._address}".lower()
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, pt.device_key)},
-            name=pt.device_name,
-            manufacturer=pt.oem_name,
-            model=pt.device_id,
-        )
+        self._attr_unique_id = f"{pt.device_key}::dp_{self._address}"
+        self._attr_device_info = coordinator.get_device_info(pt)
         self._attr_icon = "mdi:form-select"
-        self._value = initial_value
+        # Static metadata attributes, shared by every state write
+        self._base_attrs = MappingProxyType(dict(dp))
+        self._set_value(initial_value)
         self._unsub = None
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
+        self._unsub = _register_dp_callback(self.hass, self._pt.device_key, self._address, self._on_value)
 
-        @callback
-        def _handle_dp_update(device_key, address, value):
-            if device_key == self._pt.device_key and address == self._address:
-                self._value = value
-                self.async_write_ha_state()
+    async def async_will_remove_from_hass(self):
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
 
-        self._unsub = async_dispatcher_connect(self.hass, SIGNAL_DP_UPDATE, _handle_dp_update)
-        # Write initial state
+    @callback
+    def _on_value(self, value):
+        if value == self._value:
+            return  # Unchanged, skip the state write
+        self._set_value(value)
         self.async_write_ha_state()
 
-    @property
-    def native_value(self):
-        """Format type_id as type name."""
-        if isinstance(self._value, (int, float)):
-            type_id = int(self._value)
+    def _set_value(self, value):
+        """Store a new type_id and derive the type name and attributes once."""
+        self._value = value
+        if isinstance(value, (int, float)):
+            type_id = int(value)
             temp_unit = self._coordinator.get_temp_unit(self._pt.device_key)
-            config = get_sensor_config(type_id, temp_unit)
-            return config['type_name']
-        return str(self._value) if self._value is not None else None
-
-    @property
-    def extra_state_attributes(self):
-        attrs = dict(self._dp)
-        # Add raw type_id value
-        if isinstance(self._value, (int, float)):
-            attrs['type_id'] = int(self._value)
-        return attrs
+            self._attr_native_value = get_sensor_config(type_id, temp_unit).type_name
+            # Add raw type_id value
+            self._attr_extra_state_attributes = {**self._base_attrs, 'type_id': type_id}
+        else:
+            self._attr_native_value = str(value) if value is not None else None
+            self._attr_extra_state_attributes = self._base_attrs
 
 class RelayModeDiagnosticSensor(SensorEntity):
     """Diagnostic sensor for R<n> Mode registers that shows relay mode name."""
@@ -321,44 +343,41 @@ class RelayModeDiagnosticSensor(SensorEntity):
         else:
             self._attr_name = dp.get("name", f"Datapoint {self._address}")
 
-        self._attr_unique_id = f"{pt.device_key}::dp_{self._address}".lower()
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, pt.device_key)},
-            name=pt.device_name,
-            manufacturer=pt.oem_name,
-            model=pt.device_id,
-        )
+        self._attr_unique_id = f"{pt.device_key}::dp_{self._address}"
+        self._attr_device_info = coordinator.get_device_info(pt)
         self._attr_icon = "mdi:electric-switch-closed"
-        self._value = initial_value
+        # Static metadata attributes, shared by every state write
+        self._base_attrs = MappingProxyType(dict(dp))
+        self._set_value(initial_value)
         self._unsub = None
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
+        self._unsub = _register_dp_callback(self.hass, self._pt.device_key, self._address, self._on_value)
 
-        @callback
-        def _handle_dp_update(device_key, address, value):
-            if device_key == self._pt.device_key and address == self._address:
-                self._value = value
-                self.async_write_ha_state()
+    async def async_will_remove_from_hass(self):
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
 
-        self._unsub = async_dispatcher_connect(self.hass, SIGNAL_DP_UPDATE, _handle_dp_update)
+    @callback
+    def _on_value(self, value):
+        if value == self._value:
+            return  # Unchanged, skip the state write
+        self._set_value(value)
         self.async_write_ha_state()
 
-    @property
-    def native_value(self):
-        """Format mode_id as mode name."""
-        if isinstance(self._value, (int, float)):
-            mode_id = int(self._value)
-            return get_relay_mode_name(mode_id)
-        return str(self._value) if self._value is not None else None
-
-    @property
-    def extra_state_attributes(self):
-        attrs = dict(self._dp)
-        # Add raw mode_id value
-        if isinstance(self._value, (int, float)):
-            attrs['mode_id'] = int(self._value)
-        return attrs
+    def _set_value(self, value):
+        """Store a new mode_id and derive the mode name and attributes once."""
+        self._value = value
+        if isinstance(value, (int, float)):
+            mode_id = int(value)
+            self._attr_native_value = get_relay_mode_name(mode_id)
+            # Add raw mode_id value
+            self._attr_extra_state_attributes = {**self._base_attrs, 'mode_id': mode_id}
+        else:
+            self._attr_native_value = str(value) if value is not None else None
+            self._attr_extra_state_attributes = self._base_attrs
 
 class DatapointSensor(SensorEntity):
     _attr_should_poll = False
@@ -370,13 +389,8 @@ class DatapointSensor(SensorEntity):
         self._coordinator = coordinator
         self._address = int(dp.get("address"))
         self._attr_name = dp.get("name", f"Datapoint {self._address}")
-        self._attr_unique_id = f"{pt.device_key}::dp_{self._address}".lower()
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, pt.device_key)},
-            name=pt.device_name,
-            manufacturer=pt.oem_name,
-            model=pt.device_id,
-        )
+        self._attr_unique_id = f"{pt.device_key}::dp_{self._address}"
+        self._attr_device_info = coordinator.get_device_info(pt)
         self._attr_icon = "mdi:chart-line"
         self._sensor_type_name = None  # Will be set for S<n> sensors
         self._is_relay = False  # Will be set for R<n> relays
@@ -388,39 +402,41 @@ class DatapointSensor(SensorEntity):
 
         # Check if address N+1 has a mode register - if so, this is a relay
         # Use address-based detection instead of name pattern matching
-        mode_dp = coordinator.get_dp_at_address(pt.device_key, self._address + 1)
+        dp_kind = coordinator.get_dp_kind(pt.device_key, self._address)
         relay_mode_applied = False
-        if mode_dp and is_relay_mode_register(mode_dp.get("name", "")):
+        if coordinator.get_dp_kind(pt.device_key, self._address + 1).kind == DP_KIND_RELAY_MODE:
             # This is a relay - get mode configuration
             self._is_relay = True
             self._attr_icon = "mdi:electric-switch"
 
-            try:
-                mode_id = coordinator.get_relay_mode(pt.device_key, self._attr_name)
-
-                if mode_id is not None:
+            mode_id = coordinator.get_relay_mode(pt.device_key, self._attr_name)
+            if mode_id is not None:
+                try:
                     config = get_relay_config(mode_id)
-                    self._relay_mode_name = config['mode_name']
+                except (KeyError, TypeError) as e:
+                    _LOGGER.warning(f"Error applying relay mode configuration for '{self._attr_name}': {e}")
+                    config = None
+
+                if config is not None:
+                    self._relay_mode_name = config.mode_name
 
                     # Note: Binary relays should not reach here - they should be created in binary_sensor platform
                     # This is for PWM/voltage/other non-binary relays
-                    if config['is_binary']:
+                    if config.is_binary:
                         _LOGGER.warning("Binary relay %s created in sensor platform (should be in binary_sensor)", self._attr_name)
 
                     # Apply unit and device class from relay mode
-                    if config['mapped_unit']:
-                        self._attr_native_unit_of_measurement = config['mapped_unit']
-                    if config['device_class']:
-                        self._attr_device_class = config['device_class']
+                    if config.mapped_unit:
+                        self._attr_native_unit_of_measurement = config.mapped_unit
+                    if config.device_class:
+                        self._attr_device_class = config.device_class
                         self._attr_state_class = SensorStateClass.MEASUREMENT
 
                     relay_mode_applied = True
                     _LOGGER.debug("Applied relay mode config for %s: mode=%s, unit=%s, device_class=%s",
-                                 self._attr_name, config['mode_name'], config['unit'], config['device_class'])
-                else:
-                    _LOGGER.debug("Relay %s mode not yet known, using default configuration", self._attr_name)
-            except Exception as e:
-                _LOGGER.warning(f"Error applying relay mode configuration for '{self._attr_name}': {e}")
+                                 self._attr_name, config.mode_name, config.unit, config.device_class)
+            else:
+                _LOGGER.debug("Relay %s mode not yet known, using default configuration", self._attr_name)
 
             # Fallback configuration if mode not applied
             if not relay_mode_applied:
@@ -428,129 +444,91 @@ class DatapointSensor(SensorEntity):
                 _LOGGER.debug("Using fallback percentage display for relay %s", self._attr_name)
 
         # Check if this is a sensor input (S1, S2, etc.)
-        sensor_num = parse_sensor_name(self._attr_name)
         sensor_type_applied = False
 
-        if sensor_num is not None and not self._is_relay:  # Don't apply sensor logic to relays
+        if dp_kind.kind == DP_KIND_SENSOR_INPUT and not self._is_relay:  # Don't apply sensor logic to relays
             # This is a sensor input - get type configuration
-            try:
-                type_id = coordinator.get_sensor_type(pt.device_key, self._attr_name)
+            type_id = coordinator.get_sensor_type(pt.device_key, self._attr_name)
+            if type_id is not None:
                 temp_unit = coordinator.get_temp_unit(pt.device_key)
-
-                if type_id is not None:
+                try:
                     config = get_sensor_config(type_id, temp_unit)
-                    self._sensor_type_name = config['type_name']
+                except (KeyError, TypeError) as e:
+                    _LOGGER.warning(f"Error applying sensor type configuration for '{self._attr_name}': {e}")
+                    config = None
+
+                if config is not None:
+                    self._sensor_type_name = config.type_name
 
                     # Override unit and device class from sensor type
-                    if config['mapped_unit']:
-                        self._attr_native_unit_of_measurement = config['mapped_unit']
-                    if config['device_class']:
-                        self._attr_device_class = config['device_class']
+                    if config.mapped_unit:
+                        self._attr_native_unit_of_measurement = config.mapped_unit
+                    if config.device_class:
+                        self._attr_device_class = config.device_class
                         self._attr_state_class = SensorStateClass.MEASUREMENT
 
                     sensor_type_applied = True
                     _LOGGER.debug("Applied sensor type config for %s: type=%s, unit=%s, device_class=%s",
-                                 self._attr_name, config['type_name'], config['unit'], config['device_class'])
-            except Exception as e:
-                _LOGGER.warning(f"Error applying sensor type configuration for '{self._attr_name}': {e}")
+                                 self._attr_name, config.type_name, config.unit, config.device_class)
 
         # Fallback to metadata unit if sensor type wasn't applied
         if not sensor_type_applied:
-            try:
-                raw_unit = dp.get("unit")
-                if raw_unit:
-                    unit = UNIT_MAP.get(raw_unit, raw_unit)
-                    self._attr_native_unit_of_measurement = unit
-
-                    # Determine device_class
-                    device_class = DEVICE_CLASS_BY_UNIT.get(unit)
-                    if device_class:
-                        self._attr_device_class = device_class
-
-                        # state_class logic:
-                        if device_class == SensorDeviceClass.ENERGY:
-                            # Counter increases (if applicable) -> TOTAL_INCREASING
-                            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-                        else:
-                            # Normal measurement value
-                            self._attr_state_class = SensorStateClass.MEASUREMENT
-                    else:
-                        # Fallback for numeric values without known unit
-                        self._attr_state_class = SensorStateClass.MEASUREMENT
-                else:
-                    # No unit -> no long-term statistics
-                    pass
-            except Exception as e:
-                _LOGGER.warning(f"Error processing unit '{raw_unit}' for DP '{self._attr_name}': {e}")
+            # Resolved once when the metadata was registered
+            info = coordinator.get_dp_unit_info(pt.device_key, self._address)
+            if info is not None:
+                self._attr_native_unit_of_measurement, device_class, self._attr_state_class = info
+                if device_class:
+                    self._attr_device_class = device_class
+            # No unit -> no long-term statistics
+
+        # Static attributes (metadata, relay mode, sensor type) are fixed after
+        # construction; only the error attribute depends on the current value
+        base_attrs = dict(dp)
+        if self._is_relay and self._relay_mode_name:
+            base_attrs['relay_mode'] = self._relay_mode_name
+        if self._sensor_type_name:
+            base_attrs['sensor_type'] = self._sensor_type_name
+        self._base_attrs = MappingProxyType(base_attrs)
 
-        self._value = initial_value
+        self._set_value(initial_value)
         self._unsub = None
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
+        self._unsub = _register_dp_callback(self.hass, self._pt.device_key, self._address, self._on_value)
 
-        @callback
-        def _handle_dp_update(device_key, address, value):
-            if device_key == self._pt.device_key and address == self._address:
-                self._value = value
-                self.async_write_ha_state()
+    async def async_will_remove_from_hass(self):
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
 
-        self._unsub = async_dispatcher_connect(self.hass, SIGNAL_DP_UPDATE, _handle_dp_update)
-        # Write initial state (already has value)
+    @callback
+    def _on_value(self, value):
+        if value == self._value:
+            return  # Unchanged, skip the state write
+        self._set_value(value)
         self.async_write_ha_state()
 
-    @property
-    def native_value(self):
-        # Handle relay values first (R1, R2, etc.)
-        if self._is_relay:
-            if isinstance(self._value, (int, float)):
-                if self._value < 0:
-                    return None  # Negative value = error → unavailable
-            # Value is already decoded by coordinator based on relay mode
-            return self._value
-
-        # Handle sensor error codes (S1, S2, etc.)
-        if isinstance(self._value, (int, float)):
-            if self._value == -32767:
-                return None  # Sensor not connected → unavailable
-            if self._value == -32768:
-                return None  # Sensor error → unavailable
-        return self._value
-
-    @property
-    def available(self) -> bool:
-        """Mark sensor unavailable if error value received."""
-        # Check relay error (negative values)
-        if self._is_relay:
-            if isinstance(self._value, (int, float)):
-                return self._value >= 0  # Negative = not available
-            return self._value is not None
-
-        # Check sensor error codes
-        if isinstance(self._value, (int, float)):
-            return self._value not in (-32767, -32768)
-        return self._value is not None
-
-    @property
-    def extra_state_attributes(self):
-        attrs = dict(self._dp)
-
-        # Add relay error info and mode
-        if self._is_relay:
-            if isinstance(self._value, (int, float)) and self._value < 0:
-                attrs['error'] = 'Not connected'
-            if self._relay_mode_name:
-                attrs['relay_mode'] = self._relay_mode_name
-
-        # Add sensor type if applicable
-        if self._sensor_type_name:
-            attrs['sensor_type'] = self._sensor_type_name
-
-        # Add sensor error state info
-        if not self._is_relay and isinstance(self._value, (int, float)):
-            if self._value == -32767:
-                attrs['error'] = 'Not connected'
-            elif self._value == -32768:
-                attrs['error'] = 'Sensor error'
-
-        return attrs
\ No newline at end of file
+    def _set_value(self, value):
+        """Store a new value and derive state, availability and error attribute once."""
+        self._value = value
+        error = None
+        if isinstance(value, (int, float)):
+            if self._is_relay:
+                # Value is already decoded by coordinator based on relay mode
+                if value < 0:
+                    error = 'Not connected'  # Negative value = error → unavailable
+            elif value == -32767:
+                error = 'Not connected'  # Sensor not connected → unavailable
+            elif value == -32768:
+                error = 'Sensor error'  # Sensor error → unavailable
+
+        # Error values mark the sensor unavailable
+        if error is None:
+            self._attr_native_value = value
+            self._attr_available = value is not None
+            self._attr_extra_state_attributes = self._base_attrs
+        else:
+            self._attr_native_value = None
+            self._attr_available = False
+            self._attr_extra_state_attributes = {**self._base_attrs, 'error': error}
\ No newline at end of file
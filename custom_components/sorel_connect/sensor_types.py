@@ -1,19 +1,25 @@
 """Sensor type management for Sorel Connect integration."""
 from __future__ import annotations
 import logging
-from typing import Dict, Optional
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional
 from homeassistant.const import (
     PERCENTAGE,
     UnitOfTemperature,
     UnitOfPower,
+    UnitOfEnergy,
+    UnitOfElectricPotential,
+    UnitOfElectricCurrent,
     UnitOfFrequency,
     UnitOfPressure,
     UnitOfVolume,
     UnitOfIrradiance,
 )
-from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 
-from .const import SENSOR_TYPES, RELAY_MODES
+from .const import SENSOR_TYPES, RELAY_MODES, SensorType
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,34 +52,95 @@ DEVICE_CLASS_MAP = {
     "pressure": SensorDeviceClass.PRESSURE,
 }
 
-# Cache for loaded sensor types
-_sensor_types_cache: Optional[Dict[int, dict]] = None
-
-# Cache for loaded relay modes
-_relay_modes_cache: Optional[Dict[int, str]] = None
-
-
-def load_sensor_types() -> Dict[int, dict]:
+# Metadata units: optional mapping from raw strings to HA standard units
+UNIT_MAP = MappingProxyType({
+    "°C": UnitOfTemperature.CELSIUS,
+    "C": UnitOfTemperature.CELSIUS,
+    "K": UnitOfTemperature.KELVIN,
+    "°F": UnitOfTemperature.FAHRENHEIT,
+    "%": PERCENTAGE,
+    "W": UnitOfPower.WATT,
+    "kW": UnitOfPower.KILO_WATT,
+    "Wh": UnitOfEnergy.WATT_HOUR,
+    "kWh": UnitOfEnergy.KILO_WATT_HOUR,
+    "V": UnitOfElectricPotential.VOLT,
+    "A": UnitOfElectricCurrent.AMPERE,
+    "Hz": UnitOfFrequency.HERTZ,
+    "bar": UnitOfPressure.BAR,
+    "m³": UnitOfVolume.CUBIC_METERS,
+    "L": UnitOfVolume.LITERS,  # also matches "l", lookups are case-insensitive
+})
+
+# Mapping for device_class based on (already mapped) unit
+DEVICE_CLASS_BY_UNIT = MappingProxyType({
+    UnitOfTemperature.CELSIUS: SensorDeviceClass.TEMPERATURE,
+    UnitOfTemperature.FAHRENHEIT: SensorDeviceClass.TEMPERATURE,
+    UnitOfTemperature.KELVIN: SensorDeviceClass.TEMPERATURE,
+    UnitOfPower.WATT: SensorDeviceClass.POWER,
+    UnitOfPower.KILO_WATT: SensorDeviceClass.POWER,
+    UnitOfEnergy.WATT_HOUR: SensorDeviceClass.ENERGY,
+    UnitOfEnergy.KILO_WATT_HOUR: SensorDeviceClass.ENERGY,
+    UnitOfElectricPotential.VOLT: SensorDeviceClass.VOLTAGE,
+    UnitOfElectricCurrent.AMPERE: SensorDeviceClass.CURRENT,
+    UnitOfFrequency.HERTZ: SensorDeviceClass.FREQUENCY,
+    UnitOfPressure.BAR: SensorDeviceClass.PRESSURE,
+    UnitOfVolume.LITERS: SensorDeviceClass.VOLUME,
+    UnitOfVolume.CUBIC_METERS: SensorDeviceClass.VOLUME,
+})
+
+
+def _unit_info(raw_unit: str) -> tuple:
+    """Resolve a raw metadata unit to (unit, device_class, state_class)."""
+    unit = UNIT_MAP.get(raw_unit, raw_unit)
+    device_class = DEVICE_CLASS_BY_UNIT.get(unit)
+    if device_class == SensorDeviceClass.ENERGY:
+        # Counter increases (if applicable) -> TOTAL_INCREASING
+        return unit, device_class, SensorStateClass.TOTAL_INCREASING
+    # Normal measurement value (also for numeric values without known unit)
+    return unit, device_class, SensorStateClass.MEASUREMENT
+
+
+# Every known raw unit resolved up front, keyed case-insensitively:
+# lowercased raw unit -> (unit, device_class, state_class)
+UNIT_INFO = MappingProxyType({
+    raw_unit.lower(): _unit_info(raw_unit) for raw_unit in (*DEVICE_CLASS_BY_UNIT, *UNIT_MAP)
+})
+
+
+def resolve_unit(raw_unit) -> Optional[tuple]:
     """
-    Load sensor types from const.py.
+    Resolve the unit of a metadata datapoint.
+
+    Args:
+        raw_unit: Raw "unit" value from datapoint metadata (case-insensitive)
 
     Returns:
-        Dictionary mapping type_id -> {type_name, base_unit, device_class, temp_dependent}
+        (unit, device_class, state_class), or None if the datapoint has no unit
     """
-    global _sensor_types_cache
+    if not raw_unit:
+        return None
+    info = UNIT_INFO.get(raw_unit.strip().lower()) if isinstance(raw_unit, str) else None
+    if info is None:
+        info = _unit_info(str(raw_unit))
+    return info
 
-    if _sensor_types_cache is not None:
-        _LOGGER.debug(f"Returning cached sensor types ({len(_sensor_types_cache)} types)")
-        return _sensor_types_cache
 
-    _LOGGER.info(f"Loading sensor types from const.py")
+# Datapoint names handled by the name parsers: "S1", "S1 Type", "R1", "R1 Mode"
+_DP_NAME_RE = re.compile(r"([SR])(\d+)(?: +(Type|Mode))?")
 
-    # Use sensor types from const.py
-    _sensor_types_cache = SENSOR_TYPES.copy()
+# Read-only views of the const tables; consumers share them instead of copies
+_SENSOR_TYPES: Mapping[int, SensorType] = MappingProxyType(SENSOR_TYPES)
+_RELAY_MODES: Mapping[int, dict] = MappingProxyType(RELAY_MODES)
 
-    _LOGGER.info(f"Successfully loaded {len(_sensor_types_cache)} sensor types from const.py")
 
-    return _sensor_types_cache
+def load_sensor_types() -> Mapping[int, SensorType]:
+    """
+    Return the sensor types from const.py.
+
+    Returns:
+        Read-only mapping type_id -> SensorType(type_name, base_unit, device_class, temp_dependent)
+    """
+    return _SENSOR_TYPES
 
 
 def parse_sensor_name(name: str) -> Optional[int]:
@@ -94,16 +161,25 @@ def parse_sensor_name(name: str) -> Optional[int]:
         >>> parse_sensor_name("Temperature")
         None
     """
-    if not name or not isinstance(name, str):
+    # Cheap prefix check first: most datapoints are not S/R names at all.
+    # Names come from the metadata JSON and may carry leading whitespace;
+    # lstrip() returns the same object when there is none.
+    if not isinstance(name, str) or name.lstrip()[:1] != "S":
         return None
+    parsed = _parse_dp_name(name)
+    if parsed and parsed[0] == "S" and parsed[2] is None:
+        return parsed[1]
+    return None
 
-    name = name.strip()
-    if name.startswith("S") and len(name) > 1:
-        number_part = name[1:]
-        if number_part.isdigit():
-            return int(number_part)
 
-    return None
+@lru_cache(maxsize=1024)
+def _parse_dp_name(name: str) -> Optional[tuple[str, int, Optional[str], str]]:
+    """Split a datapoint name into (prefix, number, suffix, base name), e.g. "S1 Type" -> ("S", 1, "Type", "S1")."""
+    match = _DP_NAME_RE.fullmatch(name.strip())
+    if match is None:
+        return None
+    prefix, number, suffix = match.groups()
+    return prefix, int(number), suffix, prefix + number
 
 
 def parse_relay_name(name: str) -> Optional[int]:
@@ -124,15 +200,11 @@ def parse_relay_name(name: str) -> Optional[int]:
         >>> parse_relay_name("Temperature")
         None
     """
-    if not name or not isinstance(name, str):
+    if not isinstance(name, str) or name.lstrip()[:1] != "R":
         return None
-
-    name = name.strip()
-    if name.startswith("R") and len(name) > 1:
-        number_part = name[1:]
-        if number_part.isdigit():
-            return int(number_part)
-
+    parsed = _parse_dp_name(name)
+    if parsed and parsed[0] == "R" and parsed[2] is None:
+        return parsed[1]
     return None
 
 
@@ -154,69 +226,132 @@ def is_sensor_type_register(dp_name: str) -> Optional[str]:
         >>> is_sensor_type_register("S1")
         None
     """
-    if not dp_name or not isinstance(dp_name, str):
+    if not isinstance(dp_name, str) or dp_name.lstrip()[:1] != "S":
         return None
+    parsed = _parse_dp_name(dp_name)
+    if parsed and parsed[0] == "S" and parsed[2] == "Type":
+        return parsed[3]
+    return None
 
-    dp_name = dp_name.strip()
-    if dp_name.endswith(" Type") and dp_name.startswith("S"):
-        sensor_name = dp_name[:-5]  # Remove " Type"
-        if parse_sensor_name(sensor_name) is not None:
-            return sensor_name
 
-    return None
+# Datapoint kinds, derived from the datapoint name
+DP_KIND_SENSOR_INPUT = "sensor_input"  # S1, S2, ...
+DP_KIND_SENSOR_TYPE = "sensor_type"  # S1 Type, S2 Type, ...
+DP_KIND_RELAY_MODE = "relay_mode"  # R1 Mode, R2 Mode, ...
+DP_KIND_GENERIC = "generic"
+
 
+class DatapointKind(NamedTuple):
+    """Classification of a datapoint name."""
 
-def get_sensor_config(type_id: int, temp_unit: int = 0) -> dict:
+    kind: str
+    # Base name for type/mode registers ("S1" for "S1 Type", "R1" for "R1 Mode")
+    base_name: Optional[str] = None
+    # Sensor number for sensor inputs (1 for "S1")
+    sensor_num: Optional[int] = None
+
+
+DP_GENERIC = DatapointKind(DP_KIND_GENERIC)
+
+
+def classify_datapoint(dp_name: str) -> DatapointKind:
+    """
+    Classify a datapoint by its name.
+
+    Datapoint names never change once metadata is loaded, so callers classify
+    each datapoint once and keep the result instead of re-running the parsers.
+
+    Args:
+        dp_name: Datapoint name like "S1", "S1 Type", "R1 Mode"
+
+    Returns:
+        DatapointKind with the kind and the extracted name/number
+
+    Examples:
+        >>> classify_datapoint("S1 Type")
+        DatapointKind(kind='sensor_type', base_name='S1', sensor_num=None)
+        >>> classify_datapoint("S2")
+        DatapointKind(kind='sensor_input', base_name=None, sensor_num=2)
+    """
+    relay_name = is_relay_mode_register(dp_name)
+    if relay_name:
+        return DatapointKind(DP_KIND_RELAY_MODE, base_name=relay_name)
+
+    base_sensor_name = is_sensor_type_register(dp_name)
+    if base_sensor_name:
+        return DatapointKind(DP_KIND_SENSOR_TYPE, base_name=base_sensor_name)
+
+    sensor_num = parse_sensor_name(dp_name)
+    if sensor_num is not None:
+        return DatapointKind(DP_KIND_SENSOR_INPUT, sensor_num=sensor_num)
+
+    return DP_GENERIC
+
+
+class SensorConfig(NamedTuple):
+    """Resolved configuration of a sensor type."""
+
+    type_name: str
+    # Raw unit string
+    unit: Optional[str]
+    # HA unit constant
+    mapped_unit: Optional[str]
+    # HA device class
+    device_class: Optional[SensorDeviceClass]
+    # Whether the unit depends on the temperature unit setting
+    temp_dependent: bool
+
+
+def _build_config_table() -> Dict[tuple[int, int], SensorConfig]:
+    """Resolve every sensor type for both temperature unit settings."""
+    table = {}
+    for type_id, info in _SENSOR_TYPES.items():
+        unit = info.base_unit
+        mapped_unit = SENSOR_TYPE_UNIT_MAP.get(unit, unit) if unit else None
+        device_class = DEVICE_CLASS_MAP.get(info.device_class) if info.device_class else None
+        temp_dependent = info.temp_dependent
+        config = SensorConfig(info.type_name, unit, mapped_unit, device_class, temp_dependent)
+        table[(type_id, 0)] = config
+        # Handle temperature-dependent units
+        if temp_dependent and unit == "°C":
+            config = config._replace(unit="°F", mapped_unit=SENSOR_TYPE_UNIT_MAP["°F"])
+        table[(type_id, 1)] = config
+    return table
+
+
+# (type_id, temp_unit) -> SensorConfig, for every known sensor type
+_CONFIG_TABLE = _build_config_table()
+
+
+def get_sensor_config(type_id: int, temp_unit: int = 0) -> SensorConfig:
     """
     Get sensor configuration based on type ID and temperature unit setting.
 
+    All known types are resolved once at import, so this is a single table
+    lookup; the returned SensorConfig is shared between callers.
+
     Args:
         type_id: Sensor type ID from device
         temp_unit: Temperature unit setting (0=°C, 1=°F)
 
     Returns:
-        Dictionary with:
+        SensorConfig with:
             - type_name: Sensor type name
             - unit: Raw unit string
             - mapped_unit: HA unit constant
             - device_class: HA device class
             - temp_dependent: Whether unit depends on temp setting
     """
-    sensor_types = load_sensor_types()
-
-    if type_id not in sensor_types:
-        _LOGGER.warning(f"Unknown sensor type ID: {type_id}, using generic sensor")
-        return {
-            "type_name": f"Unknown Type {type_id}",
-            "unit": None,
-            "mapped_unit": None,
-            "device_class": None,
-            "temp_dependent": False,
-        }
-
-    type_info = sensor_types[type_id]
-    base_unit = type_info["base_unit"]
-
-    # Handle temperature-dependent units
-    if type_info["temp_dependent"] and base_unit == "°C":
-        if temp_unit == 1:
-            unit = "°F"
-        else:
-            unit = "°C"
-    else:
-        unit = base_unit
-
-    # Map to HA constants
-    mapped_unit = SENSOR_TYPE_UNIT_MAP.get(unit, unit) if unit else None
-    device_class = DEVICE_CLASS_MAP.get(type_info["device_class"]) if type_info["device_class"] else None
-
-    return {
-        "type_name": type_info["type_name"],
-        "unit": unit,
-        "mapped_unit": mapped_unit,
-        "device_class": device_class,
-        "temp_dependent": type_info["temp_dependent"],
-    }
+    config = _CONFIG_TABLE.get((type_id, 1 if temp_unit == 1 else 0))
+    if config is None:
+        return _unknown_sensor_config(type_id)
+    return config
+
+
+@lru_cache(maxsize=64)
+def _unknown_sensor_config(type_id: int) -> SensorConfig:
+    _LOGGER.warning(f"Unknown sensor type ID: {type_id}, using generic sensor")
+    return SensorConfig(f"Unknown Type {type_id}", None, None, None, False)
 
 
 def get_type_register_address(sensor_address: int) -> int:
@@ -243,27 +378,14 @@ def get_type_register_address(sensor_address: int) -> int:
 # Relay Mode Functions
 # ============================================================================
 
-def load_relay_modes() -> Dict[int, str]:
+def load_relay_modes() -> Mapping[int, dict]:
     """
-    Load relay modes from const.py.
+    Return the relay modes from const.py.
 
     Returns:
-        Dictionary mapping mode_id -> mode_name
+        Read-only mapping mode_id -> {mode_name, unit, device_class, scale_factor, value_mapping}
     """
-    global _relay_modes_cache
-
-    if _relay_modes_cache is not None:
-        _LOGGER.debug(f"Returning cached relay modes ({len(_relay_modes_cache)} modes)")
-        return _relay_modes_cache
-
-    _LOGGER.info(f"Loading relay modes from const.py")
-
-    # Use relay modes from const.py
-    _relay_modes_cache = RELAY_MODES.copy()
-
-    _LOGGER.info(f"Successfully loaded {len(_relay_modes_cache)} relay modes from const.py")
-
-    return _relay_modes_cache
+    return _RELAY_MODES
 
 
 def is_relay_mode_register(dp_name: str) -> Optional[str]:
@@ -284,15 +406,11 @@ def is_relay_mode_register(dp_name: str) -> Optional[str]:
         >>> is_relay_mode_register("R1")
         None
     """
-    if not dp_name or not isinstance(dp_name, str):
+    if not isinstance(dp_name, str) or dp_name.lstrip()[:1] != "R":
         return None
-
-    dp_name = dp_name.strip()
-    if dp_name.endswith(" Mode") and dp_name.startswith("R"):
-        relay_name = dp_name[:-5]  # Remove " Mode"
-        if parse_relay_name(relay_name) is not None:
-            return relay_name
-
+    parsed = _parse_dp_name(dp_name)
+    if parsed and parsed[0] == "R" and parsed[2] == "Mode":
+        return parsed[3]
     return None
 
 
@@ -314,22 +432,66 @@ def get_relay_mode_name(mode_id: int) -> str:
         >>> get_relay_mode_name(999)
         "Unknown Mode 999"
     """
-    relay_modes = load_relay_modes()
-    mode_info = relay_modes.get(mode_id)
+    mode_info = _RELAY_MODES.get(mode_id)
     if mode_info:
         return mode_info.get("mode_name", f"Unknown Mode {mode_id}")
     return f"Unknown Mode {mode_id}"
 
 
-def get_relay_config(mode_id: int) -> dict:
+class RelayConfig(NamedTuple):
+    """Resolved configuration of a relay mode."""
+
+    mode_name: str
+    # Raw unit string ("binary", "%", "V", or None)
+    unit: Optional[str]
+    # HA unit constant
+    mapped_unit: Optional[str]
+    # HA device class
+    device_class: Optional[SensorDeviceClass]
+    # Division factor for value decoding (10, 100, or None)
+    scale_factor: Optional[int]
+    # Value mapping (e.g., {0: "off", 1000: "on"})
+    value_mapping: Optional[Mapping[int, str]]
+    # True if this is a binary (on/off) relay mode
+    is_binary: bool
+
+
+def _build_relay_config_table() -> Dict[int, RelayConfig]:
+    """Resolve every relay mode to its HA configuration."""
+    table = {}
+    for mode_id, mode_info in _RELAY_MODES.items():
+        unit = mode_info["unit"]
+        # Map to HA constants
+        mapped_unit = SENSOR_TYPE_UNIT_MAP.get(unit, unit) if unit else None
+        device_class = DEVICE_CLASS_MAP.get(mode_info["device_class"]) if mode_info["device_class"] else None
+        table[mode_id] = RelayConfig(
+            mode_info["mode_name"],
+            unit,
+            mapped_unit,
+            device_class,
+            mode_info["scale_factor"],
+            mode_info["value_mapping"],
+            unit == "binary",
+        )
+    return table
+
+
+# mode_id -> RelayConfig, for every known relay mode
+_RELAY_CONFIG_TABLE = _build_relay_config_table()
+
+
+def get_relay_config(mode_id: int) -> RelayConfig:
     """
     Get relay configuration based on mode ID.
 
+    All known modes are resolved once at import, so this is a single table
+    lookup; the returned RelayConfig is shared between callers.
+
     Args:
         mode_id: Relay mode ID from device
 
     Returns:
-        Dictionary with:
+        RelayConfig with:
             - mode_name: Relay mode name
             - unit: Raw unit string ("binary", "%", "V", or None)
             - mapped_unit: HA unit constant
@@ -338,36 +500,16 @@ def get_relay_config(mode_id: int) -> dict:
             - value_mapping: Dict for value mapping (e.g., {0: "off", 1000: "on"})
             - is_binary: True if this is a binary (on/off) relay mode
     """
-    relay_modes = load_relay_modes()
-
-    if mode_id not in relay_modes:
-        _LOGGER.warning(f"Unknown relay mode ID: {mode_id}, using generic relay")
-        return {
-            "mode_name": f"Unknown Mode {mode_id}",
-            "unit": None,
-            "mapped_unit": None,
-            "device_class": None,
-            "scale_factor": None,
-            "value_mapping": None,
-            "is_binary": False,
-        }
-
-    mode_info = relay_modes[mode_id]
-    unit = mode_info["unit"]
-
-    # Map to HA constants
-    mapped_unit = SENSOR_TYPE_UNIT_MAP.get(unit, unit) if unit else None
-    device_class = DEVICE_CLASS_MAP.get(mode_info["device_class"]) if mode_info["device_class"] else None
-
-    return {
-        "mode_name": mode_info["mode_name"],
-        "unit": unit,
-        "mapped_unit": mapped_unit,
-        "device_class": device_class,
-        "scale_factor": mode_info["scale_factor"],
-        "value_mapping": mode_info["value_mapping"],
-        "is_binary": unit == "binary",
-    }
+    config = _RELAY_CONFIG_TABLE.get(mode_id)
+    if config is None:
+        return _unknown_relay_config(mode_id)
+    return config
+
+
+@lru_cache(maxsize=64)
+def _unknown_relay_config(mode_id: int) -> RelayConfig:
+    _LOGGER.warning(f"Unknown relay mode ID: {mode_id}, using generic relay")
+    return RelayConfig(f"Unknown Mode {mode_id}", None, None, None, None, None, False)
 
 
 def decode_relay_value(raw_value: int, mode_id: int) -> Any:
@@ -391,13 +533,11 @@ def decode_relay_value(raw_value: int, mode_id: int) -> Any:
         >>> decode_relay_value(0, mode_id=6)  # Switched mode
         "off"
     """
-    relay_modes = load_relay_modes()
-
-    if mode_id not in relay_modes:
+    if mode_id not in _RELAY_MODES:
         _LOGGER.debug(f"Unknown relay mode {mode_id}, returning raw value")
         return raw_value
 
-    mode_info = relay_modes[mode_id]
+    mode_info = _RELAY_MODES[mode_id]
 
     # Check for value mapping first (binary modes)
     value_mapping = mode_info.get("value_mapping")
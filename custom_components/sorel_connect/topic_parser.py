@@ -1,9 +1,10 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Optional
+import re
+import sys
+from functools import lru_cache
+from typing import NamedTuple, Optional
 
-@dataclass(frozen=True)
-class ParsedTopic:
+class ParsedTopic(NamedTuple):
     raw: str
     oem_name: str
     oem_id: str
@@ -14,44 +15,107 @@ class ParsedTopic:
     device_id: str
     unit_id: str
     address: str
+    # stabiler Schlüssel pro physischem Gerät (immer lowercase, Unique-IDs
+    # können ihn ohne weiteres .lower() verwenden); wird in parse_topic berechnet
+    device_key: str
+    model_key: str
 
-    @property
-    def device_key(self) -> str:
-        # stabiler Schlüssel pro physischem Gerät
-        return f"{self.mac.lower()}::{self.network_id.lower()}"
+    # Alle Felder folgen aus raw, also genügt raw für Gleichheit und Hash.
+    # Andere Typen (auch einfache Tupel) sind nie gleich, sonst wäre
+    # pt == tuple(pt) trotz verschiedener Hashes wahr. Sortieren (<, >)
+    # bleibt das Tupel-Verhalten über alle Felder.
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ParsedTopic) and self.raw == other.raw
 
-    @property
-    def model_key(self) -> str:
-        return self.device_id.lower()
+    def __ne__(self, other: object) -> bool:
+        return not self.__eq__(other)
 
+    def __hash__(self) -> int:
+        return hash(self.raw)
+
+# Ein Topic in einem Durchgang zerlegen; OEM- und Gerätesegment werden am ersten ":" getrennt
+_TOPIC_RE = re.compile(
+    r"([^/:]*):([^/]*)"      # <oem_name>:<oem_id>
+    r"/device"
+    r"/([^/]*)"              # mac
+    r"/([^/]*)"              # tag, z.B. "id"
+    r"/([^/]*)"              # network_id
+    r"/([^/:]*):([^/]*)"     # <device_name>:<device_id>
+    r"/dp"
+    r"/([^/]*)"              # unit_id, z.B. "00"
+    r"/([^/]*)"              # address, z.B. "40037"
+)
+
+# Brokers republish the same, finite set of datapoint topics, so parse results
+# (immutable ParsedTopic instances) are reused; parse_topic.cache_clear() resets
+@lru_cache(maxsize=4096)
 def parse_topic(topic: str) -> Optional[ParsedTopic]:
-    parts = topic.split("/")
-    # Erwartet genau 9 Segmente (0..8)
-    if len(parts) != 9:
-        return None
+    return _parse_topic(topic)
+
 
-    oem_seg      = parts[0]  # "<oem_name>:<oem_id>"
-    device_kw    = parts[1]  # "device"
-    mac          = parts[2]
-    tag          = parts[3]  # "id"
-    network_id   = parts[4]
-    dev_seg      = parts[5]  # "<device_name>:<device_id>"
-    dp_kw        = parts[6]  # "dp"
-    unit_id      = parts[7]  # "00"
-    address      = parts[8]  # "40037" etc.
-
-    if device_kw != "device" or dp_kw != "dp":
+def _parse_topic(topic: str) -> Optional[ParsedTopic]:
+    # Erwartet genau 9 Segmente (0..8):
+    # <oem_name>:<oem_id>/device/<mac>/<tag>/<network_id>/<device_name>:<device_id>/dp/<unit_id>/<address>
+    # Fremde Topics mit falscher Segmentanzahl ohne Regex verwerfen
+    if topic.count("/") != 8:
         return None
-    if ":" not in oem_seg or ":" not in dev_seg:
+
+    match = _TOPIC_RE.fullmatch(topic)
+    if match is None:
         return None
 
-    oem_name, oem_id = oem_seg.split(":", 1)
-    device_name, device_id = dev_seg.split(":", 1)
+    oem_name, oem_id, mac, tag, network_id, device_name, device_id, unit_id, address = match.groups()
 
+    # Wenige verschiedene Werte über alle Topics: internieren, damit zwischengespeicherte
+    # ParsedTopics sie teilen und Dict-Lookups per Identität vergleichen
+    intern = sys.intern
     return ParsedTopic(
         raw=topic,
-        oem_name=oem_name, oem_id=oem_id,
-        mac=mac, tag=tag, network_id=network_id,
-        device_name=device_name, device_id=device_id,
-        unit_id=unit_id, address=address,
+        oem_name=intern(oem_name), oem_id=intern(oem_id),
+        mac=intern(mac), tag=intern(tag), network_id=intern(network_id),
+        device_name=intern(device_name), device_id=intern(device_id),
+        unit_id=intern(unit_id), address=address,
+        # Einmal beim Erzeugen berechnen statt bei jedem Zugriff
+        device_key=intern(f"{mac.lower()}::{network_id.lower()}"),
+        model_key=intern(device_id.lower()),
     )
+
+
+class TopicParser:
+    """parse_topic mit eigenem Cache und Präfix-Abkürzung für einen Aufrufer (den Coordinator).
+
+    Die Datenpunkte eines Geräts unterscheiden sich nur in <unit_id>/<address>:
+    bei einem Cache-Fehlschlag mit demselben Präfix wie beim zuletzt zerlegten
+    Topic werden die übrigen Felder von dessen ParsedTopic übernommen.
+    """
+
+    __slots__ = ("_prefix", "_template", "parse")
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        # Zuletzt gesehenes Präfix bis einschließlich "/dp/" und ein ParsedTopic dazu
+        self._prefix: str | None = None
+        self._template: ParsedTopic | None = None
+        self.parse = lru_cache(maxsize=maxsize)(self._parse)
+
+    def _parse(self, topic: str) -> Optional[ParsedTopic]:
+        if topic.count("/") != 8:
+            return None
+
+        address_sep = topic.rfind("/")
+        unit_sep = topic.rfind("/", 0, address_sep)
+        # Das Präfix enthält 7 "/", das Topic genau 8: stimmt der Anfang überein,
+        # liegt auch das vorletzte "/" an derselben Stelle
+        prefix = self._prefix
+        if prefix is not None and topic.startswith(prefix):
+            template = self._template
+            return ParsedTopic._make((
+                topic, *template[1:8],
+                sys.intern(topic[unit_sep + 1:address_sep]), topic[address_sep + 1:],
+                *template[10:],
+            ))
+
+        pt = _parse_topic(topic)
+        if pt is not None:
+            self._prefix = topic[:unit_sep + 1]
+            self._template = pt
+        return pt
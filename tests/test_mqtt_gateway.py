@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Test the event-loop driven MqttGateway against a minimal local MQTT broker."""
+
+import asyncio
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "custom_components"))
+
+import sorel_connect.mqtt_gateway as mqtt_gateway
+from sorel_connect.mqtt_gateway import MqttGateway, _client_id
+
+TOPIC = "Sorel:0000/device/f412faccda84/id/00100000/TDC_Smart_Basic:00a6/dp/00/{}"
+BURST_SIZE = 50
+
+
+def _encode_length(length):
+    """Encode an MQTT remaining length."""
+    out = bytearray()
+    while True:
+        byte, length = length % 128, length // 128
+        out.append(byte | 0x80 if length else byte)
+        if not length:
+            return bytes(out)
+
+
+def _publish_packet(topic, payload):
+    body = len(topic).to_bytes(2, "big") + topic.encode() + payload
+    return b"\x30" + _encode_length(len(body)) + body
+
+
+class StubBroker:
+    """Accepts one MQTT 3.1.1 client: answers CONNECT/SUBSCRIBE/PINGREQ and can send a burst of PUBLISHes."""
+
+    def __init__(self):
+        self.subscribed = asyncio.Event()
+        self.connections = 0
+        self._writer = None
+
+    async def start(self, ssl_context=None):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0, ssl=ssl_context)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def drop_connection(self):
+        """Close the current client connection without a DISCONNECT."""
+        self._writer.transport.abort()
+
+    async def _handle(self, reader, writer):
+        self._writer = writer
+        try:
+            while True:
+                header = await reader.readexactly(1)
+                length, shift = 0, 0
+                while True:
+                    byte = (await reader.readexactly(1))[0]
+                    length |= (byte & 0x7F) << shift
+                    shift += 7
+                    if not byte & 0x80:
+                        break
+                body = await reader.readexactly(length)
+                command = header[0] & 0xF0
+                if command == 0x10:  # CONNECT
+                    self.connections += 1
+                    writer.write(b"\x20\x02\x00\x00")
+                elif command == 0x80:  # SUBSCRIBE
+                    writer.write(b"\x90\x03" + body[:2] + b"\x00")
+                    self.subscribed.set()
+                elif command == 0xC0:  # PINGREQ
+                    writer.write(b"\xd0\x00")
+                elif command == 0xE0:  # DISCONNECT
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def send_burst(self, count):
+        """Send count PUBLISH packets in a single write."""
+        self._writer.write(b"".join(
+            _publish_packet(TOPIC.format(43001 + i), b'{"value": %d}' % i) for i in range(count)
+        ))
+        await self._writer.drain()
+
+
+def _tls_contexts(workdir):
+    """Return (server_context, client_context) for a throwaway self-signed certificate, or None without openssl."""
+    if shutil.which("openssl") is None:
+        return None
+    cert = os.path.join(workdir, "cert.pem")
+    key = os.path.join(workdir, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_context.load_cert_chain(cert, key)
+    client_context = ssl.create_default_context(cafile=cert)
+    client_context.check_hostname = False
+    return server_context, client_context
+
+
+async def _connected_gateway(broker, server_context=None, client_context=None):
+    port = await broker.start(server_context)
+    received = []
+    gateway = MqttGateway("127.0.0.1", port, None, None, False)
+    if client_context is not None:
+        # Trust the throwaway certificate instead of Home Assistant's default context
+        gateway._ssl_context = client_context
+    gateway.add_listener(lambda topic, payload: received.append(topic))
+    return gateway, received
+
+
+async def _run_burst(server_context=None, client_context=None):
+    broker = StubBroker()
+    gateway, received = await _connected_gateway(broker, server_context, client_context)
+    try:
+        await gateway.connect(timeout=5)
+        gateway.subscribe(TOPIC.format("+"))
+        await asyncio.wait_for(broker.subscribed.wait(), 5)
+        await broker.send_burst(BURST_SIZE)
+        for _ in range(100):
+            if len(received) == BURST_SIZE:
+                break
+            await asyncio.sleep(0.02)
+        return len(received)
+    finally:
+        await gateway.async_stop()
+        await broker.stop()
+
+
+async def _run_idle_writes():
+    broker = StubBroker()
+    gateway, _ = await _connected_gateway(broker)
+    client = gateway._client
+    writes = 0
+    loop_write = client.loop_write
+
+    def counting_loop_write(*args):
+        nonlocal writes
+        writes += 1
+        return loop_write(*args)
+
+    # The gateway registers client.loop_write as its writer, so count the calls there
+    client.loop_write = counting_loop_write
+    try:
+        await gateway.connect(timeout=5)
+        await asyncio.sleep(0.1)
+        writes = 0
+        await asyncio.sleep(0.5)
+        return writes
+    finally:
+        await gateway.async_stop()
+        await broker.stop()
+
+
+async def _run_reconnect():
+    broker = StubBroker()
+    gateway, received = await _connected_gateway(broker)
+    client = gateway._client
+    # Record the thread of every paho call that sets up or changes socket state
+    threads = set()
+    for name in ("reconnect", "loop_read", "loop_write", "loop_misc"):
+        method = getattr(client, name)
+
+        def recording(*args, _method=method):
+            threads.add(threading.get_ident())
+            return _method(*args)
+
+        setattr(client, name, recording)
+    try:
+        await gateway.connect(timeout=5)
+        gateway.subscribe(TOPIC.format("+"))
+        await asyncio.wait_for(broker.subscribed.wait(), 5)
+        broker.subscribed.clear()
+        broker.drop_connection()
+        for _ in range(100):
+            if broker.connections == 2 and gateway.is_connected:
+                break
+            await asyncio.sleep(0.02)
+        # The broker kept no session, so the gateway subscribes again
+        await asyncio.wait_for(broker.subscribed.wait(), 5)
+        await broker.send_burst(BURST_SIZE)
+        for _ in range(100):
+            if len(received) == BURST_SIZE:
+                break
+            await asyncio.sleep(0.02)
+        return broker.connections, len(received), threads
+    finally:
+        await gateway.async_stop()
+        await broker.stop()
+
+
+def test_idle_connection_does_not_poll_writer():
+    """Once CONNECT is flushed, an idle connection must not keep a writer armed."""
+    writes = asyncio.run(_run_idle_writes())
+    assert writes < 5, f"loop_write ran {writes} times in 0.5s on an idle connection"
+
+
+def test_client_id_is_stable():
+    """The persistent session is resumed after a restart only if the client ID does not change."""
+    assert _client_id("broker", 1883, "user", "secret", False) == _client_id("broker", 1883, "user", "secret", False)
+    assert _client_id("broker", 1883, "user", "secret", False) != _client_id("broker", 1883, "user", "other", False)
+    assert _client_id("broker", 1883, "user", "secret", False) != _client_id("broker", 8883, "user", "secret", True)
+
+
+def test_burst_plain_tcp():
+    """Every message of a burst arrives over plain TCP."""
+    count = asyncio.run(_run_burst())
+    assert count == BURST_SIZE, f"received {count} of {BURST_SIZE} messages"
+
+
+def test_reconnect_on_event_loop():
+    """A dropped connection is reopened, and every paho call runs on the event loop thread."""
+    mqtt_gateway.MQTT_RECONNECT_INTERVAL, interval = 0.1, mqtt_gateway.MQTT_RECONNECT_INTERVAL
+    try:
+        connections, count, threads = asyncio.run(_run_reconnect())
+    finally:
+        mqtt_gateway.MQTT_RECONNECT_INTERVAL = interval
+    assert connections == 2, f"broker saw {connections} connections (expected 2)"
+    assert count == BURST_SIZE, f"received {count} of {BURST_SIZE} messages after reconnecting"
+    assert threads == {threading.get_ident()}, "paho was called from more than one thread"
+
+
+def test_burst_tls():
+    """Every message of a burst arrives over TLS, including records already decrypted into the SSL buffer."""
+    with tempfile.TemporaryDirectory() as workdir:
+        contexts = _tls_contexts(workdir)
+        if contexts is None:
+            raise unittest.SkipTest("openssl not available")
+        count = asyncio.run(_run_burst(*contexts))
+    assert count == BURST_SIZE, f"received {count} of {BURST_SIZE} messages over TLS"
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("MQTT gateway test suite")
+    print("=" * 60)
+
+    try:
+        test_idle_connection_does_not_poll_writer()
+        test_client_id_is_stable()
+        test_burst_plain_tcp()
+        test_reconnect_on_event_loop()
+        try:
+            test_burst_tls()
+        except unittest.SkipTest as e:
+            print(f"- TLS burst test skipped: {e}")
+        print("✓ All tests passed!")
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -13,22 +13,17 @@ from sensor_types import (
 )
 
 def test_load_sensor_types():
-    """Test loading sensor types from CSV."""
-    print("\n=== Testing CSV Loading ===")
+    """Test loading sensor types from const.py."""
     types = load_sensor_types()
-    print(f"Loaded {len(types)} sensor types")
+    assert len(types) > 0, "No sensor types loaded"
 
     # Test a few known types
-    if 2 in types:
-        print(f"Type 2 (Temperature): {types[2]}")
-    if 3 in types:
-        print(f"Type 3 (Humidity): {types[3]}")
-    if 23 in types:
-        print(f"Type 23 (Flow): {types[23]}")
+    assert types[2].type_name == "sensorTemperature"
+    assert types[3].type_name == "sensorHumidity"
+    assert types[23].type_name == "sensorFlow"
 
 def test_parse_sensor_name():
     """Test parsing sensor names."""
-    print("\n=== Testing Sensor Name Parsing ===")
     test_cases = [
         ("S1", 1),
         ("S2", 2),
@@ -39,12 +34,10 @@ def test_parse_sensor_name():
 
     for name, expected in test_cases:
         result = parse_sensor_name(name)
-        status = "✓" if result == expected else "✗"
-        print(f"{status} parse_sensor_name('{name}') = {result} (expected {expected})")
+        assert result == expected, f"parse_sensor_name({name!r}) = {result} (expected {expected})"
 
 def test_is_sensor_type_register():
     """Test detecting sensor type registers."""
-    print("\n=== Testing Sensor Type Register Detection ===")
     test_cases = [
         ("S1 Type", "S1"),
         ("S2 Type", "S2"),
@@ -55,54 +48,26 @@ def test_is_sensor_type_register():
 
     for name, expected in test_cases:
         result = is_sensor_type_register(name)
-        status = "✓" if result == expected else "✗"
-        print(f"{status} is_sensor_type_register('{name}') = {result} (expected {expected})")
+        assert result == expected, f"is_sensor_type_register({name!r}) = {result} (expected {expected})"
 
 def test_get_sensor_config():
     """Test getting sensor configuration."""
-    print("\n=== Testing Sensor Configuration ===")
-
-    # Test temperature sensor with °C
-    print("\nTemperature sensor (type_id=2, temp_unit=0 for °C):")
-    config = get_sensor_config(2, 0)
-    print(f"  Type: {config['type_name']}")
-    print(f"  Unit: {config['unit']}")
-    print(f"  Mapped Unit: {config['mapped_unit']}")
-    print(f"  Device Class: {config['device_class']}")
-
-    # Test temperature sensor with °F
-    print("\nTemperature sensor (type_id=2, temp_unit=1 for °F):")
-    config = get_sensor_config(2, 1)
-    print(f"  Type: {config['type_name']}")
-    print(f"  Unit: {config['unit']}")
-    print(f"  Mapped Unit: {config['mapped_unit']}")
-    print(f"  Device Class: {config['device_class']}")
-
-    # Test humidity sensor
-    print("\nHumidity sensor (type_id=3):")
-    config = get_sensor_config(3, 0)
-    print(f"  Type: {config['type_name']}")
-    print(f"  Unit: {config['unit']}")
-    print(f"  Mapped Unit: {config['mapped_unit']}")
-    print(f"  Device Class: {config['device_class']}")
-
-    # Test flow sensor
-    print("\nFlow sensor (type_id=23):")
-    config = get_sensor_config(23, 0)
-    print(f"  Type: {config['type_name']}")
-    print(f"  Unit: {config['unit']}")
-    print(f"  Mapped Unit: {config['mapped_unit']}")
-    print(f"  Device Class: {config['device_class']}")
+    # (type_id, temp_unit) -> (type_name, unit, mapped_unit, device_class)
+    test_cases = [
+        ((2, 0), ("sensorTemperature", "°C", "°C", "temperature")),  # Temperature with °C
+        ((2, 1), ("sensorTemperature", "°F", "°F", "temperature")),  # Temperature with °F
+        ((3, 0), ("sensorHumidity", "%", "%", "humidity")),
+        ((23, 0), ("sensorFlow", "L/min", "L/min", None)),
+        ((999, 0), ("Unknown Type 999", None, None, None)),  # Unknown type
+    ]
 
-    # Test unknown type
-    print("\nUnknown sensor (type_id=999):")
-    config = get_sensor_config(999, 0)
-    print(f"  Type: {config['type_name']}")
-    print(f"  Unit: {config['unit']}")
+    for (type_id, temp_unit), expected in test_cases:
+        config = get_sensor_config(type_id, temp_unit)
+        result = (config.type_name, config.unit, config.mapped_unit, config.device_class)
+        assert result == expected, f"get_sensor_config({type_id}, {temp_unit}) = {result} (expected {expected})"
 
 def test_get_type_register_address():
     """Test calculating type register addresses."""
-    print("\n=== Testing Type Register Address Calculation ===")
     test_cases = [
         (43001, 43002),  # S1 -> S1 Type
         (43003, 43004),  # S2 -> S2 Type
@@ -111,8 +76,7 @@ def test_get_type_register_address():
 
     for sensor_addr, expected in test_cases:
         result = get_type_register_address(sensor_addr)
-        status = "✓" if result == expected else "✗"
-        print(f"{status} get_type_register_address({sensor_addr}) = {result} (expected {expected})")
+        assert result == expected, f"get_type_register_address({sensor_addr}) = {result} (expected {expected})"
 
 if __name__ == "__main__":
     print("=" * 60)
@@ -126,9 +90,10 @@ if __name__ == "__main__":
         test_get_sensor_config()
         test_get_type_register_address()
 
-        print("\n" + "=" * 60)
-        print("All tests completed!")
-        print("=" * 60)
+        print("✓ All tests passed!")
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
     except Exception as e:
         print(f"\n✗ Test failed with error: {e}")
         import traceback
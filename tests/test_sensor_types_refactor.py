@@ -8,57 +8,40 @@ from sensor_types import load_sensor_types, load_relay_modes, get_sensor_config,
 
 def test_sensor_types():
     """Test sensor types loading."""
-    print("Testing sensor types...")
     sensor_types = load_sensor_types()
 
-    print(f"✓ Loaded {len(sensor_types)} sensor types")
-
     # Test a few specific types
     assert 2 in sensor_types, "Type 2 (temperature) not found"
-    assert sensor_types[2]["type_name"] == "sensorTemperature"
-    assert sensor_types[2]["base_unit"] == "°C"
-    assert sensor_types[2]["temp_dependent"] == True
-    print("✓ Type 2 (sensorTemperature) validated")
+    assert sensor_types[2].type_name == "sensorTemperature"
+    assert sensor_types[2].base_unit == "°C"
+    assert sensor_types[2].temp_dependent == True
 
     assert 10 in sensor_types, "Type 10 (switchPower) not found"
-    assert sensor_types[10]["type_name"] == "switchPower"
-    assert sensor_types[10]["base_unit"] == "W"
-    print("✓ Type 10 (switchPower) validated")
+    assert sensor_types[10].type_name == "switchPower"
+    assert sensor_types[10].base_unit == "W"
 
     # Test get_sensor_config function
     config = get_sensor_config(2, temp_unit=0)
-    assert config["type_name"] == "sensorTemperature"
-    assert config["unit"] == "°C"
-    print("✓ get_sensor_config() works correctly")
-
-    print("✓ All sensor type tests passed!\n")
+    assert config.type_name == "sensorTemperature"
+    assert config.unit == "°C"
 
 def test_relay_modes():
     """Test relay modes loading."""
-    print("Testing relay modes...")
     relay_modes = load_relay_modes()
 
-    print(f"✓ Loaded {len(relay_modes)} relay modes")
-
     # Test a few specific modes
     assert 0 in relay_modes, "Mode 0 not found"
-    assert relay_modes[0] == "switched"
-    print("✓ Mode 0 (switched) validated")
+    assert relay_modes[0]["mode_name"] == "switched"
 
     assert 7 in relay_modes, "Mode 7 not found"
-    assert relay_modes[7] == "switched cycle"
-    print("✓ Mode 7 (switched cycle) validated")
+    assert relay_modes[7]["mode_name"] == "switched cycle"
 
     assert 15 in relay_modes, "Mode 15 not found"
-    assert relay_modes[15] == "error"
-    print("✓ Mode 15 (error) validated")
+    assert relay_modes[15]["mode_name"] == "error"
 
     # Test get_relay_mode_name function
     mode_name = get_relay_mode_name(9)
     assert mode_name == "pwm control"
-    print("✓ get_relay_mode_name() works correctly")
-
-    print("✓ All relay mode tests passed!\n")
 
 if __name__ == "__main__":
     print("=" * 60)
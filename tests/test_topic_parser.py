@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Test MQTT topic parsing: regex parser vs. the original split parser, and TopicParser's prefix fast path vs. a full parse."""
+
+import random
+import sys
+sys.path.insert(0, '../custom_components/sorel_connect')
+
+from topic_parser import TopicParser, parse_topic
+
+FIELDS = (
+    "raw", "oem_name", "oem_id", "mac", "tag", "network_id",
+    "device_name", "device_id", "unit_id", "address", "device_key", "model_key",
+)
+
+# Segment values mixing valid parts with the separators and keywords the parser keys on
+SEGMENTS = (
+    "", ":", "::", "a:b:c", "Sorel:0000", "sorel:1A", "device", "Device", "dp", "DP",
+    "f412faccda84", "F4:12:FA", "id", "00100000", "default",
+    "TDC_Smart_Basic:00a6", "TBS5:4F", "dev ice:x", "00", "01", "43001", "44004", "ä:ö",
+)
+RANDOM_TOPICS = 20000
+
+
+def _reference_parse(topic):
+    """The original str.split based parser; returns the field values or None."""
+    parts = topic.split("/")
+    if len(parts) != 9:
+        return None
+    oem_seg, device_kw, mac, tag, network_id, dev_seg, dp_kw, unit_id, address = parts
+    if device_kw != "device" or dp_kw != "dp":
+        return None
+    if ":" not in oem_seg or ":" not in dev_seg:
+        return None
+    oem_name, oem_id = oem_seg.split(":", 1)
+    device_name, device_id = dev_seg.split(":", 1)
+    return (
+        topic, oem_name, oem_id, mac, tag, network_id, device_name, device_id, unit_id, address,
+        f"{mac.lower()}::{network_id.lower()}", device_id.lower(),
+    )
+
+
+def _cold_parse(topic):
+    """Full parse without the lru_cache."""
+    return parse_topic.__wrapped__(topic)
+
+
+def _fields(pt):
+    return None if pt is None else tuple(getattr(pt, name) for name in FIELDS)
+
+
+def _random_topics(rng):
+    topics = []
+    for _ in range(RANDOM_TOPICS):
+        # Mostly well-formed topics with a few segments swapped, plus wrong segment counts
+        parts = ["Sorel:0000", "device", "f412faccda84", "id", "00100000", "TDC_Smart_Basic:00a6", "dp", "00", "43001"]
+        for _ in range(rng.randint(0, 3)):
+            parts[rng.randrange(len(parts))] = rng.choice(SEGMENTS)
+        if rng.random() < 0.1:
+            del parts[rng.randrange(len(parts))]
+        elif rng.random() < 0.1:
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(SEGMENTS))
+        topics.append("/".join(parts))
+    return topics
+
+
+def test_regex_matches_split_parser():
+    """The single-regex parser accepts and splits exactly what the split parser did."""
+    rng = random.Random(1234)
+    for topic in _random_topics(rng):
+        expected = _reference_parse(topic)
+        result = _fields(_cold_parse(topic))
+        assert result == expected, f"parse_topic({topic!r}) = {result} (expected {expected})"
+
+
+def test_prefix_fast_path_matches_full_parse():
+    """Parsing topics that share a device prefix gives the same fields as parsing each one from scratch."""
+    rng = random.Random(5678)
+    topics = _random_topics(rng)
+    # Sorted, so neighbouring topics share prefixes and hit the fast path
+    topics += sorted(topics)
+    topics += [f"sorel:1A/device/F4:12:FA/id/default/TBS5:4F/dp/{unit}/{address}"
+               for unit in ("00", "01", "") for address in ("43001", "44004", "", ":")]
+    expected = [_fields(_cold_parse(topic)) for topic in topics]
+
+    # maxsize=0 turns off the parser's cache, so every topic goes through the prefix check
+    parser = TopicParser(maxsize=0)
+    for topic, fields in zip(topics, expected):
+        result = _fields(parser.parse(topic))
+        assert result == fields, f"TopicParser.parse({topic!r}) = {result} (expected {fields})"
+
+
+def test_topic_parsers_are_independent():
+    """A TopicParser keeps its prefix to itself; parse_topic never depends on earlier calls."""
+    first = "Sorel:0000/device/f412faccda84/id/00100000/TDC_Smart_Basic:00a6/dp/00/43001"
+    second = "sorel:1A/device/F4:12:FA/id/default/TBS5:4F/dp/01/44004"
+    parser = TopicParser()
+    assert parser.parse(first) == _cold_parse(first)
+    assert TopicParser().parse(second).device_key == _cold_parse(second).device_key
+    assert parse_topic(second).device_key == _cold_parse(second).device_key
+
+
+def test_parsed_topic_equality():
+    """ParsedTopic compares and hashes by its raw topic only, and never equals a plain tuple."""
+    pt = parse_topic("Sorel:0000/device/f412faccda84/id/00100000/TDC_Smart_Basic:00a6/dp/00/43001")
+    assert pt == _cold_parse(pt.raw)
+    assert hash(pt) == hash(pt.raw)
+    assert pt != tuple(pt)
+    assert tuple(pt) != pt
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Topic parser test suite")
+    print("=" * 60)
+
+    try:
+        test_regex_matches_split_parser()
+        test_prefix_fast_path_matches_full_parse()
+        test_topic_parsers_are_independent()
+        test_parsed_topic_equality()
+        print("✓ All tests passed!")
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)